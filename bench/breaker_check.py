@@ -0,0 +1,146 @@
+"""Regression check for how request failures are charged to circuit breakers.
+
+    python -m bench.breaker_check
+
+Each scenario sends one session's requests through a local proxy to the
+offline API mock and compares the failures recorded on the proxy and
+endpoint breakers with what the scenario expects. The script exits with
+code 1 when any scenario charges the wrong breaker.
+"""
+import os
+import sys
+import asyncio
+import argparse
+import importlib
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "benchmark")
+os.chdir(tempfile.mkdtemp(prefix="nutsfarm-bench-"))
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _connect_proxy(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    request = await reader.readuntil(b'\r\n\r\n')
+    host, port = request.split(b' ')[1].decode().rsplit(':', 1)
+    upstream_reader, upstream_writer = await asyncio.open_connection(host, int(port))
+    writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+    await writer.drain()
+    await asyncio.gather(_pipe(reader, upstream_writer), _pipe(upstream_reader, writer))
+
+
+async def _stalled_proxy(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # Accepts the connection and never answers the handshake
+    while await reader.read(65536):
+        pass
+    writer.close()
+
+
+async def _start_proxy(handler) -> tuple[asyncio.AbstractServer, str]:
+    server = await asyncio.start_server(handler, '127.0.0.1', 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+async def _refused_proxy() -> str:
+    server = await asyncio.start_server(_stalled_proxy, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_scenario(name: str, proxy_url: str, base_url: str, expect: str) -> bool:
+    from bot.config import settings
+    from bot.core.tapper import Tapper
+    from bot.core.rate_limiter import rate_limiter
+    from bot.core.circuit_breaker import circuit_breakers
+    from bot.utils.metrics import normalize_endpoint
+    from bench.fake_telegram import FakeTelegramClient
+
+    settings.BASE_URL = base_url
+    circuit_breakers._breakers.clear()
+
+    tapper = Tapper(FakeTelegramClient(f"breaker_{name}"))
+    tapper.token = 'benchmark'
+    await tapper.setup_proxy(proxy_url)
+
+    async def proxy_alive() -> bool:
+        return True
+
+    tapper.check_proxy = proxy_alive
+    try:
+        await tapper._make_request('GET', 'user/current')
+    finally:
+        await tapper.close()
+
+    host = rate_limiter.host_of(f"{base_url}api")
+    endpoint = circuit_breakers._endpoint_breaker(host, normalize_endpoint('user/current'))
+    proxy = circuit_breakers._proxy_breaker(tapper.get_proxy_url())
+    charged = {'endpoint': endpoint.failures, 'proxy': proxy.failures}
+    spared = 'proxy' if expect == 'endpoint' else 'endpoint'
+    ok = charged[expect] > 0 and charged[spared] == 0
+
+    print(
+        f"{name}: endpoint failures {charged['endpoint']}, proxy failures {charged['proxy']} "
+        f"(expected {expect}) - {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+async def run_checks() -> bool:
+    from bot.config import settings
+    from bench.mock_api import MockConfig, start_mock_api
+
+    settings.MAX_RETRIES = 2
+    settings.RETRY_POLICY = 'fixed'
+    settings.RETRY_DELAY = (0, 0)
+    settings.RATE_LIMIT_ENABLED = False
+    settings.SESSION_CYCLE_TIMEOUT = 0
+    settings.REQUEST_CONNECT_TIMEOUT = 0.5
+    settings.REQUEST_READ_TIMEOUT = 0.3
+    settings.REQUEST_TIMEOUT = (5, 5)
+
+    fast_runner, fast_url = await start_mock_api(MockConfig())
+    slow_runner, slow_url = await start_mock_api(MockConfig(latency=(2.0, 2.0)))
+    healthy, healthy_url = await _start_proxy(_connect_proxy)
+    stalled, stalled_url = await _start_proxy(_stalled_proxy)
+    try:
+        results = [
+            await run_scenario('slow API behind a healthy proxy', healthy_url, slow_url, expect='endpoint'),
+            await run_scenario('stalled proxy', stalled_url, fast_url, expect='proxy'),
+            await run_scenario('refused proxy', await _refused_proxy(), fast_url, expect='proxy')
+        ]
+    finally:
+        for server in (healthy, stalled):
+            server.close()
+        await fast_runner.cleanup()
+        await slow_runner.cleanup()
+    return all(results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--show-logs", action="store_true", help="Keep the bot's console output")
+    args = parser.parse_args()
+
+    if not args.show_logs:
+        from rich.console import Console
+        importlib.import_module('bot.utils.logger').console = Console(file=open(os.devnull, 'w'))
+
+    return 0 if asyncio.run(run_checks()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
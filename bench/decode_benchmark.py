@@ -0,0 +1,136 @@
+"""Micro-benchmark of the response decoder against the previous decode path.
+
+    python -m bench.decode_benchmark --number 20000
+
+The previous path is reproduced on top of a minimal stand-in for
+aiohttp's ClientResponse that decodes the body for every json()/text() call,
+the way aiohttp does.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timezone, timedelta
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "benchmark")
+os.chdir(tempfile.mkdtemp(prefix="nutsfarm-bench-"))
+
+from bot.utils.decoder import JSON_BACKEND, decode_body  # noqa: E402
+
+
+class RecordedResponse:
+    def __init__(self, body: bytes, content_type: str):
+        self._body = body
+        self.headers = {'Content-Type': content_type}
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode('utf-8')
+
+    async def json(self):
+        if 'json' not in self.headers['Content-Type']:
+            raise ValueError('Attempt to decode JSON with unexpected mimetype')
+        stripped = self._body.strip()
+        if not stripped:
+            return None
+        return json.loads(stripped.decode('utf-8'))
+
+
+async def legacy_decode(response: RecordedResponse):
+    content_type = response.headers.get('Content-Type', '')
+
+    if 'application/json' in content_type:
+        return await response.json()
+    elif 'text/plain' in content_type:
+        text = await response.text()
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            try:
+                return float(text)
+            except ValueError:
+                return text
+    else:
+        try:
+            return await response.json()
+        except:
+            text = await response.text()
+            try:
+                return json.loads(text)
+            except:
+                try:
+                    return float(text)
+                except:
+                    return text
+
+
+async def new_decode(response: RecordedResponse):
+    return decode_body(await response.read(), response.headers.get('Content-Type', ''))
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def recorded_payloads() -> dict[str, tuple[bytes, str]]:
+    now = datetime.now(timezone.utc)
+    tasks = [
+        {
+            'title': f'Task {i}',
+            'link': 'https://t.me/example',
+            'task': {'id': str(uuid.uuid4()), 'type': 'URL', 'reward': 100 * i, 'createdAt': _iso(now)}
+        }
+        for i in range(60)
+    ]
+    user = {
+        'balance': 123456, 'username': 'user', 'firstname': 'First', 'lastname': 'Last',
+        'isStartBonusClaimed': True, 'cryptonProfileUsername': None, 'tonWallet': None
+    }
+    html = ('<html><head><meta property="og:title" content="Channel"></head><body>' + 'x' * 20000 +
+            '<a href="tg://resolve?domain=example">Open</a></body></html>')
+    return {
+        'task/active': (json.dumps(tasks).encode(), 'application/json'),
+        'user/current': (json.dumps(user).encode(), 'application/json'),
+        'farming/current': (json.dumps({'status': 'FARMING', 'lastFarmingFinishAt': _iso(now)}).encode(), 'application/json'),
+        'referrals/amount': (b'12.5', 'text/plain;charset=UTF-8'),
+        'referrals/time': (_iso(now + timedelta(hours=8)).encode(), 'text/plain;charset=UTF-8'),
+        'story/read': (b'10', 'text/plain;charset=UTF-8'),
+        'channel page': (html.encode(), 'text/html; charset=utf-8'),
+    }
+
+
+async def measure(decode, response: RecordedResponse, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        await decode(response)
+    return (time.perf_counter() - started) / number * 1_000_000
+
+
+async def run(number: int) -> None:
+    print(f"JSON backend: {JSON_BACKEND}")
+    print(f"{'payload':<18} {'bytes':>7} {'legacy µs':>10} {'decoder µs':>11} {'speedup':>8}")
+    for name, (body, content_type) in recorded_payloads().items():
+        response = RecordedResponse(body, content_type)
+        legacy = await measure(legacy_decode, response, number)
+        new = await measure(new_decode, response, number)
+        print(f"{name:<18} {len(body):>7} {legacy:>10.2f} {new:>11.2f} {legacy / new:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response decoder micro-benchmark")
+    parser.add_argument("--number", type=int, default=20000, help="Decodes per payload")
+    args = parser.parse_args()
+    asyncio.run(run(args.number))
+
+
+if __name__ == "__main__":
+    main()
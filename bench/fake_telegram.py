@@ -0,0 +1,54 @@
+import json
+import random
+import asyncio
+from types import SimpleNamespace
+from urllib.parse import quote, urlencode
+
+from pyrogram import raw
+
+
+class FakeTelegramClient:
+    def __init__(self, name: str, user_id: int | None = None, rpc_latency: tuple = (0.0, 0.0)):
+        self.name = name
+        self.user_id = user_id or random.randint(10**8, 10**10)
+        self.rpc_latency = rpc_latency
+        self.proxy = None
+        self.is_connected = False
+        self.connects = 0
+        self.rpc_calls = 0
+
+    async def _rpc(self) -> None:
+        self.rpc_calls += 1
+        low, high = self.rpc_latency
+        if high > 0:
+            await asyncio.sleep(random.uniform(low, high))
+
+    async def connect(self) -> bool:
+        await self._rpc()
+        self.connects += 1
+        self.is_connected = True
+        return True
+
+    async def disconnect(self) -> None:
+        self.is_connected = False
+
+    async def resolve_peer(self, peer_id):
+        await self._rpc()
+        return raw.types.InputPeerUser(user_id=7000000000, access_hash=random.getrandbits(63))
+
+    async def invoke(self, query):
+        await self._rpc()
+        user = json.dumps({'id': self.user_id, 'first_name': 'Mock', 'username': self.name})
+        init_data = urlencode({
+            'user': user,
+            'auth_date': '1700000000',
+            'start_param': getattr(query, 'start_param', '') or '',
+            'hash': 'mock'
+        })
+        return SimpleNamespace(
+            url=f"https://nutsfarm.crypton.xyz/#tgWebAppData={quote(init_data)}&tgWebAppVersion=7.10"
+        )
+
+    async def get_me(self):
+        await self._rpc()
+        return SimpleNamespace(id=self.user_id, first_name='Mock', last_name='', username=self.name)
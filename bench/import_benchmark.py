@@ -0,0 +1,101 @@
+"""Import-time budget check for the launcher and the action-1 import path.
+
+    python -m bench.import_benchmark --repeat 5
+
+Each scenario is imported in a fresh interpreter. The script reports the
+median import time and the slowest modules (from -X importtime). It exits
+with code 1 when a scenario is over budget or imports a module that its
+action does not need.
+"""
+import os
+import sys
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'launcher': {
+        'modules': ['bot.utils.launcher'],
+        'budget_ms': 400,
+        'forbidden': ['flask', 'werkzeug', 'pyrogram', 'colorama', 'bot.core', 'bot.utils.web']
+    },
+    'action-1': {
+        'modules': ['bot.utils.launcher', 'bot.core.scheduler'],
+        'budget_ms': 1500,
+        'forbidden': ['flask', 'werkzeug', 'colorama', 'bot.utils.web']
+    }
+}
+
+CHILD_CODE = """
+import sys, time
+started = time.perf_counter()
+{imports}
+print(time.perf_counter() - started)
+print(','.join(sys.modules))
+"""
+
+
+def _run_child(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    env = {**os.environ, 'PYTHONPATH': PROJECT_ROOT, 'PYTHONDONTWRITEBYTECODE': '1'}
+    env.setdefault('API_ID', '1')
+    env.setdefault('API_HASH', 'benchmark')
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    with tempfile.TemporaryDirectory(prefix='nutsfarm-bench-') as workdir:
+        result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else 'import failed')
+    return result
+
+
+def _slowest_modules(importtime_output: str, top: int) -> list[tuple[str, int]]:
+    modules = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us)))
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:top]
+
+
+def run_scenario(name: str, scenario: dict, repeat: int, top: int) -> bool:
+    code = CHILD_CODE.format(imports='\n'.join(f'import {module}' for module in scenario['modules']))
+
+    timings = []
+    loaded = set()
+    for _ in range(repeat):
+        elapsed, modules = _run_child(code).stdout.strip().splitlines()
+        timings.append(float(elapsed) * 1000)
+        loaded = set(modules.split(','))
+
+    median = statistics.median(timings)
+    forbidden = [module for module in scenario['forbidden'] if module in loaded]
+    ok = median <= scenario['budget_ms'] and not forbidden
+
+    print(f"{name}: {median:.0f} ms median over {repeat} runs (budget {scenario['budget_ms']} ms) "
+          f"- {'OK' if ok else 'FAIL'}")
+    if forbidden:
+        print(f"  unexpected imports: {', '.join(forbidden)}")
+    for module, self_us in _slowest_modules(_run_child(code, importtime=True).stderr, top):
+        print(f"  {self_us / 1000:8.1f} ms  {module}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='Slowest modules to list per scenario')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append')
+    args = parser.parse_args()
+
+    results = [
+        run_scenario(name, SCENARIOS[name], args.repeat, args.top)
+        for name in args.scenario or SCENARIOS
+    ]
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
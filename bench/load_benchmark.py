@@ -0,0 +1,183 @@
+"""End-to-end load benchmark against the offline API mock.
+
+    python -m bench.load_benchmark --sessions 10 100 1000 --duration 30
+
+Every run uses synthetic sessions backed by FakeTelegramClient and a fresh
+working directory, so nothing under the real sessions/ folder is touched.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import importlib
+import tempfile
+import resource
+import statistics
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "benchmark")
+os.environ.setdefault("AUTO_UPDATE", "False")
+os.chdir(tempfile.mkdtemp(prefix="nutsfarm-bench-"))
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def current_rss_mb() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_benchmark(sessions: int, duration: float, workers: int, cycle_interval: float, config) -> dict:
+    from bot.config import settings
+    from bot.core import tapper as tapper_module
+    from bot.core.scheduler import SessionScheduler
+    from bot.core.rate_limiter import rate_limiter
+    from bench.mock_api import start_mock_api
+    from bench.fake_telegram import FakeTelegramClient
+
+    runner, base_url = await start_mock_api(config)
+    settings.BASE_URL = base_url
+    settings.ACTION_DELAY = (0, 0)
+    settings.RETRY_DELAY = (0, 0)
+    rate_limiter._buckets.clear()
+
+    latencies: dict[str, list[float]] = {}
+    outcomes = {'failed': 0, 'cancelled': 0}
+    original_make_request = tapper_module.Tapper._make_request
+
+    async def timed_make_request(self, method, endpoint, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = await original_make_request(self, method, endpoint, **kwargs)
+        except asyncio.CancelledError:
+            outcomes['cancelled'] += 1
+            raise
+        except BaseException:
+            outcomes['failed'] += 1
+            raise
+        if result is None:
+            outcomes['failed'] += 1
+        else:
+            latencies.setdefault(endpoint.split('/')[0], []).append(time.perf_counter() - started)
+        return result
+
+    tapper_module.Tapper._make_request = timed_make_request
+
+    class BenchmarkScheduler(SessionScheduler):
+        cycles = 0
+
+        def schedule(self, session_name: str, delay: float) -> None:
+            super().schedule(session_name, min(delay, cycle_interval))
+
+        async def _run_cycle(self, session_name: str):
+            next_run_in = await super()._run_cycle(session_name)
+            if next_run_in is not None:
+                BenchmarkScheduler.cycles += 1
+            return next_run_in
+
+    scheduler = BenchmarkScheduler(workers=workers)
+    run_id = f"{sessions}_{int(time.time())}"
+    for index in range(sessions):
+        scheduler.add_session(FakeTelegramClient(f"bench_{run_id}_{index}"), None)
+
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(scheduler.run(), timeout=duration)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - started
+
+    tapper_module.Tapper._make_request = original_make_request
+    await runner.cleanup()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'sessions': sessions,
+        'cycles': BenchmarkScheduler.cycles,
+        'cycles_per_sec': BenchmarkScheduler.cycles / elapsed,
+        'calls': len(all_latencies),
+        'failed': outcomes['failed'],
+        'cancelled': outcomes['cancelled'],
+        'p50_ms': percentile(all_latencies, 50) * 1000,
+        'p99_ms': percentile(all_latencies, 99) * 1000,
+        'mean_ms': (statistics.fmean(all_latencies) * 1000) if all_latencies else 0.0,
+        'rss_mb': current_rss_mb(),
+        'rss_delta_mb': current_rss_mb() - rss_before,
+        'per_group': {
+            group: (percentile(values, 50) * 1000, percentile(values, 99) * 1000, len(values))
+            for group, values in sorted(latencies.items())
+        }
+    }
+
+
+def print_report(results: list[dict], verbose: bool) -> None:
+    print()
+    print(
+        f"{'sessions':>9} {'cycles':>8} {'cycles/s':>9} {'calls':>8} {'failed':>8} {'cancel':>8} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'ΔRSS MB':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['sessions']:>9} {r['cycles']:>8} {r['cycles_per_sec']:>9.2f} {r['calls']:>8} "
+            f"{r['failed']:>8} {r['cancelled']:>8} "
+            f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['rss_mb']:>8.1f} {r['rss_delta_mb']:>8.1f}"
+        )
+        if verbose:
+            for group, (p50, p99, count) in r['per_group'].items():
+                print(f"{'':>9} {group:<12} n={count:<7} p50={p50:.2f}ms p99={p99:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NutsFarm end-to-end load benchmark")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per run")
+    parser.add_argument("--workers", type=int, default=50, help="Scheduler worker pool size")
+    parser.add_argument("--cycle-interval", type=float, default=1.0, help="Cap on the delay between cycles of one session")
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--unauthorized-ratio", type=float, default=0.0)
+    parser.add_argument("--concurrent-cycle", action="store_true", help="Enable CONCURRENT_CYCLE for the run")
+    parser.add_argument("--verbose", action="store_true", help="Print latency per endpoint group")
+    parser.add_argument("--show-logs", action="store_true", help="Keep the bot's console output")
+    args = parser.parse_args()
+
+    from bot.config import settings
+    from bench.mock_api import MockConfig
+    from rich.console import Console
+
+    logger_module = importlib.import_module('bot.utils.logger')
+
+    if not args.show_logs:
+        devnull = open(os.devnull, 'w')
+        logger_module.console = Console(file=devnull)
+
+    settings.CONCURRENT_CYCLE = args.concurrent_cycle
+
+    config = MockConfig(
+        latency=tuple(args.latency),
+        rate_limit_ratio=args.rate_limit_ratio,
+        unauthorized_ratio=args.unauthorized_ratio
+    )
+
+    results = []
+    for sessions in args.sessions:
+        print(f"Running {sessions} sessions for {args.duration:.0f}s...", file=sys.stderr)
+        results.append(asyncio.run(run_benchmark(sessions, args.duration, args.workers, args.cycle_interval, config)))
+    print_report(results, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
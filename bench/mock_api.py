@@ -0,0 +1,254 @@
+"""Offline stand-in for the NutsFarm API.
+
+Run standalone with ``python -m bench.mock_api --port 8081`` and point BASE_URL
+at ``http://127.0.0.1:8081/``, or start it in-process with ``start_mock_api``.
+"""
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from datetime import datetime, timezone, timedelta
+
+from aiohttp import web
+
+
+class MockConfig:
+    def __init__(
+        self,
+        latency: tuple = (0.0, 0.0),
+        rate_limit_ratio: float = 0.0,
+        unauthorized_ratio: float = 0.0,
+        retry_after: int = 1,
+        farming_seconds: int = 3600,
+        stories: int = 1,
+        tasks: int = 0,
+        lessons: int = 0,
+        verify_seconds: float = 0
+    ):
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.unauthorized_ratio = unauthorized_ratio
+        self.retry_after = retry_after
+        self.farming_seconds = farming_seconds
+        self.stories = stories
+        self.tasks = tasks
+        self.lessons = lessons
+        self.verify_seconds = verify_seconds
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _tokens() -> dict:
+    return {'accessToken': uuid.uuid4().hex, 'refreshToken': uuid.uuid4().hex}
+
+
+def _text(value) -> web.Response:
+    return web.Response(text=str(value), content_type='text/plain')
+
+
+def create_app(config: MockConfig | None = None) -> web.Application:
+    config = config or MockConfig()
+    routes = web.RouteTableDef()
+    user_tasks: dict[str, dict[str, dict]] = {}
+
+    def tasks_of(request) -> dict[str, dict]:
+        return user_tasks.setdefault(request.headers.get('authorization', ''), {})
+
+    def task_state(user_task: dict) -> dict:
+        ready_at = user_task.get('readyAt')
+        if user_task['status'] == 'VERIFYING' and ready_at is not None and ready_at <= time.monotonic():
+            user_task['status'] = 'COMPLETED'
+        return {key: value for key, value in user_task.items() if key != 'readyAt'}
+
+    story_ids = [str(uuid.uuid4()) for _ in range(config.stories)]
+    task_ids = [str(uuid.uuid4()) for _ in range(config.tasks)]
+    lesson_ids = [str(uuid.uuid4()) for _ in range(config.lessons)]
+
+    @web.middleware
+    async def faults(request: web.Request, handler):
+        low, high = config.latency
+        if high > 0:
+            await asyncio.sleep(random.uniform(low, high))
+
+        if random.random() < config.rate_limit_ratio:
+            return web.Response(status=429, headers={'Retry-After': str(config.retry_after)})
+
+        is_auth_call = request.path.startswith('/api/v1/auth/')
+        if not is_auth_call:
+            if not request.headers.get('authorization', '').startswith('Bearer '):
+                return web.Response(status=401)
+            if random.random() < config.unauthorized_ratio:
+                return web.Response(status=401)
+
+        return await handler(request)
+
+    @routes.post('/api/v1/auth/login')
+    async def login(request):
+        await request.text()
+        return web.json_response(_tokens())
+
+    @routes.post('/api/v1/auth/register')
+    async def register(request):
+        await request.json()
+        return web.json_response(_tokens())
+
+    @routes.post('/api/v1/auth/token')
+    async def refresh(request):
+        await request.json()
+        return web.json_response(_tokens())
+
+    @routes.get('/api/v1/user/current')
+    async def user_current(request):
+        return web.json_response({
+            'balance': random.randint(0, 100000),
+            'username': 'mock_user',
+            'firstname': 'Mock',
+            'lastname': 'User',
+            'isStartBonusClaimed': True,
+            'cryptonProfileUsername': None,
+            'tonWallet': None
+        })
+
+    @routes.get('/api/v1/streak/current/info')
+    async def streak_info(request):
+        return web.json_response({'streakRewardReceivedToday': True, 'daysMissed': 0})
+
+    @routes.post('/api/v1/streak/current/claim')
+    async def streak_claim(request):
+        return web.json_response({})
+
+    @routes.get('/api/v1/user/current/referrals/amount')
+    async def referral_amount(request):
+        return _text(0)
+
+    @routes.get('/api/v1/user/current/referrals/time')
+    async def referral_time(request):
+        return _text(_iso(datetime.now(timezone.utc) + timedelta(hours=8)))
+
+    @routes.post('/api/v1/user/current/referrals/claim')
+    async def referral_claim(request):
+        return _text(0)
+
+    @routes.get('/api/v1/user/current/referrals')
+    async def referrals(request):
+        return web.json_response({'total': 0, 'items': []})
+
+    @routes.get('/api/v1/story/active')
+    async def story_active(request):
+        return web.json_response([{'id': story_id} for story_id in story_ids])
+
+    @routes.get('/api/v1/story/current')
+    async def story_current(request):
+        return web.json_response([])
+
+    @routes.post('/api/v1/story/read/{story_id}')
+    async def story_read(request):
+        return _text(10)
+
+    @routes.get('/api/v1/learn/active')
+    async def learn_active(request):
+        lessons = [
+            {'id': lesson_id, 'title': f'Lesson {i}', 'reward': 10, 'pageNumber': i, 'isClaimed': False}
+            for i, lesson_id in enumerate(lesson_ids)
+        ]
+        return web.json_response([{
+            'id': 'module', 'title': 'Module', 'isActive': True, 'isPublished': True, 'lessons': lessons
+        }] if lessons else [])
+
+    @routes.post('/api/v1/learn/claim/{lesson_id}')
+    async def learn_claim(request):
+        return _text(10)
+
+    @routes.get('/api/v1/task/active')
+    async def task_active(request):
+        return web.json_response([
+            {'title': f'Task {i}', 'link': 'https://example.com', 'task': {'id': task_id, 'type': 'URL', 'reward': 100}}
+            for i, task_id in enumerate(task_ids)
+        ])
+
+    @routes.get('/api/v1/task/current')
+    async def task_current(request):
+        return web.json_response([task_state(user_task) for user_task in tasks_of(request).values()])
+
+    @routes.post('/api/v1/task/start')
+    async def task_start(request):
+        data = await request.json()
+        user_task = {'id': str(uuid.uuid4()), 'taskId': data.get('taskId'), 'status': 'PENDING'}
+        tasks_of(request)[user_task['id']] = user_task
+        return web.json_response(task_state(user_task))
+
+    @routes.post('/api/v1/task/verify')
+    async def task_verify(request):
+        data = await request.json()
+        user_task = tasks_of(request).get(data.get('userTaskId'))
+        if user_task is None:
+            return web.json_response({'id': data.get('userTaskId'), 'status': 'COMPLETED'})
+        user_task['status'] = 'VERIFYING'
+        user_task['readyAt'] = time.monotonic() + config.verify_seconds
+        return web.json_response(task_state(user_task))
+
+    @routes.post('/api/v1/task/claim')
+    async def task_claim(request):
+        data = await request.json()
+        user_task = tasks_of(request).get(data.get('userTaskId'))
+        if user_task is not None:
+            user_task['status'] = 'CLAIMED'
+        return web.json_response({'id': data.get('userTaskId'), 'status': 'CLAIMED', 'task': {'reward': 100}})
+
+    @routes.get('/api/v1/farming/current')
+    async def farming_current(request):
+        finish = datetime.now(timezone.utc) + timedelta(seconds=config.farming_seconds)
+        return web.json_response({'status': 'FARMING', 'lastFarmingFinishAt': _iso(finish)})
+
+    @routes.post('/api/v1/farming/farm')
+    async def farming_farm(request):
+        return web.json_response({})
+
+    @routes.post('/api/v1/farming/claim')
+    async def farming_claim(request):
+        return _text(100)
+
+    @routes.post('/api/v1/farming/startBonus')
+    async def farming_start_bonus(request):
+        return _text(100)
+
+    app = web.Application(middlewares=[faults])
+    app.add_routes(routes)
+    return app
+
+
+async def start_mock_api(config: MockConfig | None = None, host: str = '127.0.0.1', port: int = 0):
+    runner = web.AppRunner(create_app(config), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline NutsFarm API mock")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--unauthorized-ratio", type=float, default=0.0)
+    parser.add_argument("--farming-seconds", type=int, default=3600)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=tuple(args.latency),
+        rate_limit_ratio=args.rate_limit_ratio,
+        unauthorized_ratio=args.unauthorized_ratio,
+        farming_seconds=args.farming_seconds
+    )
+    print(json.dumps(vars(config)))
+    web.run_app(create_app(config), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
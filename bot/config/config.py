@@ -15,26 +15,87 @@ class Settings(BaseSettings):
     TASK_COMPLETION_DELAY: tuple = (5, 10)
     VERIFY_CHECK_ATTEMPTS: int = 10
     VERIFY_CHECK_DELAY: tuple = (3, 5)
+    VERIFY_WAIT_TIMEOUT: int = 30
     ACTION_DELAY: tuple = (2, 4)
 
     REQUEST_TIMEOUT: tuple = (30, 60)
+    REQUEST_CONNECT_TIMEOUT: float = 10
+    REQUEST_READ_TIMEOUT: float = 30
+    AUTH_TIMEOUT: tuple = (10, 20, 30)
+    EXTERNAL_TIMEOUT: tuple = (5, 10, 15)
+    SESSION_CYCLE_TIMEOUT: int = 3600
     RETRY_DELAY: tuple = (3, 10)
     MAX_RETRIES: int = 5
+    RETRY_POLICY: str = "decorrelated"
+    RETRY_BASE_DELAY: float = 1
+    RETRY_MAX_DELAY: float = 60
+    RETRY_BUDGET_ATTEMPTS: int = 20
+    RETRY_BUDGET_SECONDS: int = 300
+
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 10
+    HTTP_KEEPALIVE_TIMEOUT: int = 60
+
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_RPS: float = 10
+    RATE_LIMIT_BURST: int = 20
+    RATE_LIMIT_MIN_RPS: float = 0.5
+    RATE_LIMIT_BACKOFF_FACTOR: float = 0.5
+    RATE_LIMIT_RECOVERY_STEP: float = 0.1
+    RATE_LIMIT_PER_PROXY: bool = False
+    RATE_LIMIT_PER_PROXY_RPS: float = 2
+    RATE_LIMIT_PER_PROXY_BURST: int = 5
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKER_FAILURES: int = 5
+    CIRCUIT_BREAKER_RECOVERY: int = 60
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS: int = 1
     
     AUTO_UPDATE: bool = True
     CHECK_UPDATE_INTERVAL: int = 300
+    UPDATE_CHECK_TIMEOUT: int = 60
 
     SLEEP_TIME: tuple = (3600, 7200)
+    MAX_CONCURRENT_SESSIONS: int = 20
+    CONCURRENT_CYCLE: bool = False
+    CYCLE_CONCURRENCY: int = 4
+    SESSION_WATCH_ENABLED: bool = True
+    SESSION_WATCH_INTERVAL: int = 10
+    SESSION_WATCH_SETTLE: int = 5
+    TG_MAX_CONNECTIONS: int = 50
+    TG_IDLE_TIMEOUT: int = 600
+    ACCOUNT_STORE_FLUSH_DELAY: float = 5
+
+    ACCESS_TOKEN_TTL: int = 3600
+    REFRESH_TOKEN_TTL: int = 604800
+    TOKEN_EXPIRY_MARGIN: int = 120
 
     BASE_URL: str = "https://api.nutsfarm.crypton.xyz/"
     API_VERSION: str = "v1"
 
     LOGGING_LEVEL: str = "INFO"
     ENABLE_RICH_LOGGING: bool = True
+    LOG_FORMAT: str = "rich"
+    LOG_QUEUE_SIZE: int = 10000
     LOG_USER_AGENT: bool = True
     LOG_PROXY: bool = True
     LOG_PROXY_CHECK: bool = False
 
+    METRICS_ENABLED: bool = False
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9108
+
+    EVENT_LOOP: str = "asyncio"
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL: float = 0.5
+    LOOP_MONITOR_REPORT_INTERVAL: int = 300
+    LOOP_MONITOR_DEBUG: bool = False
+    LOOP_SLOW_CALLBACK: float = 0.1
+
+    PROXY_CHECK_TTL: int = 600
+    PROXY_CHECK_FAILURE_TTL: int = 60
+    PROXY_CHECK_TIMEOUT: int = 15
+    PROXY_CHECK_HEDGE_DELAY: float = 1.0
+
     @property
     def API_URL(self) -> str:
         return f"{self.BASE_URL}/api/{self.API_VERSION}"
@@ -1,9 +1,12 @@
-from .tapper import Tapper, run_tapper, run_tappers
+from .tapper import Tapper, process_session
+from .scheduler import SessionScheduler, run_tapper, run_tappers
 from .headers import get_headers
 from .user_agents import generate_android_user_agent, load_or_generate_user_agent
 
 __all__ = [
     'Tapper',
+    'process_session',
+    'SessionScheduler',
     'run_tapper',
     'run_tappers',
     'get_headers',
@@ -0,0 +1,137 @@
+import time
+from urllib.parse import urlparse
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.utils.metrics import CIRCUIT_STATE, CIRCUIT_TRANSITIONS, CIRCUIT_REJECTED
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_started = 0.0
+        CIRCUIT_STATE.set(STATE_VALUES[CLOSED], breaker=self.name)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        CIRCUIT_STATE.set(STATE_VALUES[state], breaker=self.name)
+        CIRCUIT_TRANSITIONS.inc(breaker=self.name, state=state)
+
+    @property
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + settings.CIRCUIT_BREAKER_RECOVERY - time.monotonic())
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self.opened_at < settings.CIRCUIT_BREAKER_RECOVERY:
+                return False
+            self._transition(HALF_OPEN)
+            self.probes = 0
+            logger.info(f"Circuit breaker | {self.name} half-open, sending a trial request")
+
+        if self.state == HALF_OPEN:
+            # A trial request that never reported back frees its slot after the recovery period
+            if self.probes >= settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS:
+                if now - self.probe_started < settings.CIRCUIT_BREAKER_RECOVERY:
+                    return False
+                self.probes = 0
+            self.probes += 1
+            self.probe_started = now
+        return True
+
+    def release(self) -> None:
+        if self.state == HALF_OPEN and self.probes > 0:
+            self.probes -= 1
+
+    def on_success(self) -> None:
+        self.failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+            logger.info(f"Circuit breaker | {self.name} closed")
+
+    def on_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.failures >= settings.CIRCUIT_BREAKER_FAILURES
+        ):
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+            logger.warning(
+                f"Circuit breaker | {self.name} opened after {self.failures} failures, "
+                f"failing fast for {settings.CIRCUIT_BREAKER_RECOVERY}s"
+            )
+
+
+class CircuitBreakers:
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def _breaker(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name)
+        return breaker
+
+    def _endpoint_breaker(self, host: str, endpoint: str) -> CircuitBreaker:
+        return self._breaker(f"endpoint:{host}/{endpoint}")
+
+    def _proxy_breaker(self, proxy_url: str | None) -> CircuitBreaker | None:
+        if not proxy_url:
+            return None
+        parsed = urlparse(proxy_url)
+        return self._breaker(f"proxy:{parsed.hostname}:{parsed.port}")
+
+    def acquire(self, host: str, endpoint: str, proxy_url: str | None = None) -> CircuitBreaker | None:
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return None
+
+        proxy_breaker = self._proxy_breaker(proxy_url)
+        if proxy_breaker and not proxy_breaker.allow():
+            CIRCUIT_REJECTED.inc(breaker=proxy_breaker.name)
+            return proxy_breaker
+
+        endpoint_breaker = self._endpoint_breaker(host, endpoint)
+        if not endpoint_breaker.allow():
+            if proxy_breaker:
+                proxy_breaker.release()
+            CIRCUIT_REJECTED.inc(breaker=endpoint_breaker.name)
+            return endpoint_breaker
+        return None
+
+    def record(
+        self,
+        host: str,
+        endpoint: str,
+        proxy_url: str | None,
+        endpoint_ok: bool | None,
+        proxy_ok: bool | None
+    ) -> None:
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return
+
+        outcomes = [(self._endpoint_breaker(host, endpoint), endpoint_ok)]
+        proxy_breaker = self._proxy_breaker(proxy_url)
+        if proxy_breaker:
+            outcomes.append((proxy_breaker, proxy_ok))
+
+        for breaker, ok in outcomes:
+            if ok is None:
+                breaker.release()
+            elif ok:
+                breaker.on_success()
+            else:
+                breaker.on_failure()
+
+
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,157 @@
+import time
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from pyrogram import Client
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.utils.metrics import TG_OPEN_CONNECTIONS, TG_CONNECTS
+
+
+class ConnectionManager:
+    def __init__(self, max_connections: int | None = None, idle_timeout: float | None = None):
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._clients: OrderedDict[str, Client] = OrderedDict()
+        self._proxies: dict[str, dict | None] = {}
+        self._last_used: dict[str, float] = {}
+        self._in_use: dict[str, int] = {}
+        self._seen: set[str] = set()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._reaper: asyncio.Task | None = None
+        self._loop = None
+
+    @property
+    def limit(self) -> int:
+        return max(1, self.max_connections or settings.TG_MAX_CONNECTIONS)
+
+    @property
+    def timeout(self) -> float:
+        return self.idle_timeout if self.idle_timeout is not None else settings.TG_IDLE_TIMEOUT
+
+    @property
+    def open_connections(self) -> int:
+        return len(self._clients)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._locks.clear()
+            self._reaper = None
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    def _lock(self, name: str) -> asyncio.Lock:
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = self._locks[name] = asyncio.Lock()
+        return lock
+
+    async def _connect(self, client: Client) -> None:
+        name = client.name
+        if name in self._clients and client.is_connected and self._proxies.get(name) == client.proxy:
+            return
+
+        if client.is_connected:
+            await client.disconnect()
+
+        # Pooled clients are connected but never started, so nothing would consume their updates
+        client.no_updates = True
+        logger.info(f"{name} | Connecting to Telegram...")
+        await client.connect()
+        logger.success(f"{name} | Successfully connected to Telegram")
+
+        TG_CONNECTS.inc(kind='reconnect' if name in self._seen else 'new')
+        self._seen.add(name)
+        self._clients[name] = client
+        self._proxies[name] = client.proxy
+        TG_OPEN_CONNECTIONS.set(len(self._clients))
+
+    @staticmethod
+    def _drain_updates(client: Client) -> None:
+        dispatcher = getattr(client, 'dispatcher', None)
+        queue = getattr(dispatcher, 'updates_queue', None)
+        while queue is not None and not queue.empty():
+            queue.get_nowait()
+
+    async def _disconnect(self, name: str) -> None:
+        client = self._clients.pop(name, None)
+        self._proxies.pop(name, None)
+        self._last_used.pop(name, None)
+        TG_OPEN_CONNECTIONS.set(len(self._clients))
+        if client:
+            self._drain_updates(client)
+        if client and client.is_connected:
+            try:
+                await client.disconnect()
+            except Exception as e:
+                logger.warning(f"{name} | Error disconnecting from Telegram: {e}")
+
+    async def _disconnect_unused(self, name: str, still_wanted=None) -> bool:
+        # Holds the same per-name lock as connection(), so a client being handed out is never disconnected
+        if self._in_use.get(name):
+            return False
+        async with self._lock(name):
+            if name not in self._clients or self._in_use.get(name) or (still_wanted and not still_wanted()):
+                return False
+            await self._disconnect(name)
+            return True
+
+    async def _evict(self) -> None:
+        for name in list(self._clients):
+            if len(self._clients) <= self.limit:
+                return
+            await self._disconnect_unused(name, lambda: len(self._clients) > self.limit)
+
+    async def _reap_idle(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, min(30.0, self.timeout / 2)))
+            deadline = time.monotonic() - self.timeout
+
+            def idle(name: str) -> bool:
+                return self._last_used.get(name, 0) <= deadline
+
+            for name in list(self._clients):
+                client = self._clients.get(name)
+                if client is not None:
+                    self._drain_updates(client)
+                if idle(name) and await self._disconnect_unused(name, lambda: idle(name)):
+                    logger.info(f"{name} | Disconnected idle Telegram connection")
+
+    @asynccontextmanager
+    async def connection(self, client: Client):
+        self._bind_loop()
+        name = client.name
+        self._in_use[name] = self._in_use.get(name, 0) + 1
+        try:
+            async with self._lock(name):
+                await self._connect(client)
+            self._clients.move_to_end(name)
+            self._drain_updates(client)
+            yield client
+        finally:
+            self._in_use[name] -= 1
+            if not self._in_use[name]:
+                del self._in_use[name]
+            if name in self._clients:
+                self._drain_updates(client)
+                self._last_used[name] = time.monotonic()
+                if self.timeout <= 0:
+                    await self._disconnect_unused(name)
+            await self._evict()
+
+    async def release(self, client: Client) -> None:
+        async with self._lock(client.name):
+            await self._disconnect(client.name)
+
+    async def close(self) -> None:
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        await asyncio.gather(*(self._disconnect(name) for name in list(self._clients)), return_exceptions=True)
+
+
+connection_manager = ConnectionManager()
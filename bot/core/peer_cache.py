@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+from pyrogram import raw
+
+from bot.utils.account_store import account_store
+
+
+class PeerCache:
+    key = 'telegram'
+
+    def _get(self, session_name: str) -> dict:
+        return account_store.get(session_name, self.key) or {}
+
+    def _set(self, session_name: str, entry: dict) -> None:
+        account_store.set(session_name, self.key, entry)
+
+    def get_peer(self, session_name: str, username: str) -> raw.types.InputPeerUser | None:
+        peer = self._get(session_name).get('peers', {}).get(username)
+        if not peer:
+            return None
+        return raw.types.InputPeerUser(user_id=peer['user_id'], access_hash=peer['access_hash'])
+
+    def save_peer(self, session_name: str, username: str, peer) -> None:
+        if not isinstance(peer, raw.types.InputPeerUser):
+            return
+        entry = self._get(session_name)
+        peers = dict(entry.get('peers', {}))
+        peers[username] = {'user_id': peer.user_id, 'access_hash': peer.access_hash}
+        self._set(session_name, {**entry, 'peers': peers})
+
+    def invalidate_peer(self, session_name: str, username: str) -> None:
+        entry = self._get(session_name)
+        peers = dict(entry.get('peers', {}))
+        if peers.pop(username, None) is not None:
+            self._set(session_name, {**entry, 'peers': peers})
+
+    def get_me(self, session_name: str) -> SimpleNamespace | None:
+        me = self._get(session_name).get('me')
+        return SimpleNamespace(**me) if me else None
+
+    def save_me(self, session_name: str, user) -> None:
+        entry = self._get(session_name)
+        self._set(session_name, {**entry, 'me': {
+            'id': user.id,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'username': user.username
+        }})
+
+    def clear(self, session_name: str) -> None:
+        account_store.delete(session_name, self.key)
+
+
+peer_cache = PeerCache()
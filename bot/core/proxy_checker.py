@@ -0,0 +1,196 @@
+import time
+import asyncio
+from urllib.parse import urlparse
+
+from aiohttp import ClientSession, ClientTimeout
+from aiohttp_socks import ProxyConnector
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.core.headers import get_proxy_check_headers
+from bot.utils.metrics import PROXY_CHECK_DURATION, PROXY_CHECK_ATTEMPTS, PROXY_CHECK_ENDPOINT_LATENCY
+
+
+class ProxyStatus:
+    def __init__(self, alive: bool, country: str | None = None, endpoint: str | None = None):
+        self.alive = alive
+        self.country = country
+        self.endpoint = endpoint
+        self.checked_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.checked_at
+
+
+class EndpointStats:
+    ALPHA = 0.3
+
+    def __init__(self, endpoint: str, order: int):
+        self.endpoint = endpoint
+        self.host = urlparse(endpoint).hostname
+        self.order = order
+        self.latency: float | None = None
+        self.failure_rate = 0.0
+
+    def _observe_latency(self, latency: float) -> None:
+        self.latency = latency if self.latency is None else self.latency + self.ALPHA * (latency - self.latency)
+        PROXY_CHECK_ENDPOINT_LATENCY.set(self.latency, endpoint=self.host)
+
+    def record_success(self, latency: float) -> None:
+        self._observe_latency(latency)
+        self.failure_rate -= self.ALPHA * self.failure_rate
+        PROXY_CHECK_ATTEMPTS.inc(endpoint=self.host, result='success')
+
+    def record_failure(self) -> None:
+        self.failure_rate += self.ALPHA * (1 - self.failure_rate)
+        PROXY_CHECK_ATTEMPTS.inc(endpoint=self.host, result='failure')
+
+    def record_cancelled(self, elapsed: float) -> None:
+        # Lost the race: it took at least this long, which is enough to rank it lower
+        self._observe_latency(max(elapsed, self.latency or 0))
+        PROXY_CHECK_ATTEMPTS.inc(endpoint=self.host, result='cancelled')
+
+    @property
+    def sort_key(self) -> tuple[float, int]:
+        latency = settings.PROXY_CHECK_HEDGE_DELAY if self.latency is None else self.latency
+        return latency / max(0.05, 1 - self.failure_rate), self.order
+
+
+class ProxyChecker:
+    ENDPOINTS = [
+        'http://ip-api.com/json',
+        'https://ipinfo.io/json',
+        'https://speed.cloudflare.com/meta'
+    ]
+
+    def __init__(self):
+        self._statuses: dict[str, ProxyStatus] = {}
+        self._probes: dict[str, asyncio.Task] = {}
+        self.endpoint_stats = {
+            endpoint: EndpointStats(endpoint, order) for order, endpoint in enumerate(self.ENDPOINTS)
+        }
+
+    @staticmethod
+    def _label(proxy_url: str) -> str:
+        parsed = urlparse(proxy_url)
+        return f"{parsed.hostname}:{parsed.port}"
+
+    def _is_fresh(self, status: ProxyStatus) -> bool:
+        ttl = settings.PROXY_CHECK_TTL if status.alive else settings.PROXY_CHECK_FAILURE_TTL
+        return status.age < ttl
+
+    def get_cached(self, proxy_url: str) -> ProxyStatus | None:
+        return self._statuses.get(proxy_url)
+
+    def invalidate(self, proxy_url: str) -> None:
+        self._statuses.pop(proxy_url, None)
+
+    async def check(self, proxy_url: str, user_agent: str) -> ProxyStatus:
+        status = self._statuses.get(proxy_url)
+        if status:
+            if self._is_fresh(status):
+                return status
+            if status.alive:
+                self._revalidate(proxy_url, user_agent)
+                return status
+
+        return await asyncio.shield(self._revalidate(proxy_url, user_agent))
+
+    def _revalidate(self, proxy_url: str, user_agent: str) -> asyncio.Task:
+        probe = self._probes.get(proxy_url)
+        if probe is None or probe.done():
+            probe = asyncio.create_task(self._probe(proxy_url, user_agent))
+            self._probes[proxy_url] = probe
+            probe.add_done_callback(lambda task: self._forget_probe(proxy_url, task))
+        return probe
+
+    def _forget_probe(self, proxy_url: str, task: asyncio.Task) -> None:
+        if self._probes.get(proxy_url) is task:
+            del self._probes[proxy_url]
+
+    def ordered_endpoints(self) -> list[str]:
+        return [stats.endpoint for stats in sorted(self.endpoint_stats.values(), key=lambda stats: stats.sort_key)]
+
+    async def _fetch(self, session: ClientSession, endpoint: str, headers: dict) -> ProxyStatus:
+        stats = self.endpoint_stats[endpoint]
+        started = time.perf_counter()
+        try:
+            async with session.get(
+                endpoint,
+                headers=headers,
+                ssl=False,
+                timeout=ClientTimeout(total=settings.PROXY_CHECK_TIMEOUT)
+            ) as response:
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                data = await response.json(content_type=None)
+        except asyncio.CancelledError:
+            stats.record_cancelled(time.perf_counter() - started)
+            raise
+        except Exception:
+            stats.record_failure()
+            raise
+
+        stats.record_success(time.perf_counter() - started)
+        country = data.get('country') or data.get('countryCode')
+        return ProxyStatus(alive=True, country=country, endpoint=endpoint)
+
+    async def _race(self, session: ClientSession, headers: dict, label: str) -> ProxyStatus:
+        waiting = self.ordered_endpoints()
+        running: dict[asyncio.Task, str] = {}
+        try:
+            while waiting or running:
+                if waiting:
+                    endpoint = waiting.pop(0)
+                    running[asyncio.create_task(self._fetch(session, endpoint, headers))] = endpoint
+
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=settings.PROXY_CHECK_HEDGE_DELAY if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    endpoint = running.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        if settings.LOG_PROXY_CHECK:
+                            logger.debug(f"Proxy {label} | Failed to check via {endpoint}: {str(e)}")
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return ProxyStatus(alive=False)
+
+    async def _probe(self, proxy_url: str, user_agent: str) -> ProxyStatus:
+        label = self._label(proxy_url)
+        headers = get_proxy_check_headers(user_agent)
+        status = ProxyStatus(alive=False)
+        started = time.perf_counter()
+
+        try:
+            connector = ProxyConnector.from_url(proxy_url)
+            async with ClientSession(connector=connector) as session:
+                status = await self._race(session, headers, label)
+        except Exception as e:
+            if settings.LOG_PROXY_CHECK:
+                logger.warning(f"Proxy {label} | Proxy check failed: {str(e)}")
+
+        if settings.LOG_PROXY_CHECK:
+            if status.alive:
+                logger.info(f"Proxy {label} | Check successful via {status.endpoint} | Country: {status.country}")
+            else:
+                logger.warning(f"Proxy {label} | All proxy check endpoints failed")
+
+        PROXY_CHECK_DURATION.observe(
+            time.perf_counter() - started,
+            result='alive' if status.alive else 'dead'
+        )
+        self._statuses[proxy_url] = status
+        return status
+
+
+proxy_checker = ProxyChecker()
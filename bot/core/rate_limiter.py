@@ -0,0 +1,108 @@
+import time
+import asyncio
+from urllib.parse import urlparse
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.utils.metrics import RATE_LIMIT_RATE
+
+
+class TokenBucket:
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        RATE_LIMIT_RATE.set(self.rate, bucket=self.name)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_rate_limited(self, retry_after: float) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0
+        # Concurrent 429s from the same server window lower the rate only once
+        already_paused = now < self.blocked_until
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        if already_paused:
+            return
+        self.rate = max(settings.RATE_LIMIT_MIN_RPS, self.rate * settings.RATE_LIMIT_BACKOFF_FACTOR)
+        RATE_LIMIT_RATE.set(self.rate, bucket=self.name)
+        logger.warning(f"Rate limiter | {self.name} paused for {retry_after:.0f}s, rate lowered to {self.rate:.2f} req/s")
+
+    def on_success(self) -> None:
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + settings.RATE_LIMIT_RECOVERY_STEP)
+            RATE_LIMIT_RATE.set(self.rate, bucket=self.name)
+
+
+class RateLimiter:
+    def __init__(self):
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _bucket(self, name: str, rate: float, capacity: float) -> TokenBucket:
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = TokenBucket(name, rate, capacity)
+        return bucket
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc
+
+    def _host_bucket(self, host: str) -> TokenBucket:
+        return self._bucket(f"host:{host}", settings.RATE_LIMIT_RPS, settings.RATE_LIMIT_BURST)
+
+    def _proxy_bucket(self, proxy_url: str | None) -> TokenBucket | None:
+        if not settings.RATE_LIMIT_PER_PROXY or not proxy_url:
+            return None
+        parsed = urlparse(proxy_url)
+        return self._bucket(
+            f"proxy:{parsed.hostname}:{parsed.port}",
+            settings.RATE_LIMIT_PER_PROXY_RPS,
+            settings.RATE_LIMIT_PER_PROXY_BURST
+        )
+
+    async def acquire(self, host: str, proxy_url: str | None = None) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        proxy_bucket = self._proxy_bucket(proxy_url)
+        if proxy_bucket:
+            await proxy_bucket.acquire()
+        await self._host_bucket(host).acquire()
+
+    def on_rate_limited(self, host: str, proxy_url: str | None, retry_after: float) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        self._host_bucket(host).on_rate_limited(retry_after)
+
+    def on_success(self, host: str, proxy_url: str | None = None) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        self._host_bucket(host).on_success()
+        proxy_bucket = self._proxy_bucket(proxy_url)
+        if proxy_bucket:
+            proxy_bucket.on_success()
+
+
+rate_limiter = RateLimiter()
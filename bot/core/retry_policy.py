@@ -0,0 +1,78 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from bot.config import settings
+from bot.exceptions import RetryBudgetExhausted
+from bot.utils.metrics import RETRY_BUDGET_EXHAUSTED
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    def delay(self, attempt: int, previous: float) -> float:
+        raise NotImplementedError
+
+
+class FixedDelay(RetryPolicy):
+    def delay(self, attempt: int, previous: float) -> float:
+        return random.uniform(settings.RETRY_DELAY[0], settings.RETRY_DELAY[1])
+
+
+class ExponentialBackoff(RetryPolicy):
+    def delay(self, attempt: int, previous: float) -> float:
+        return random.uniform(0, min(settings.RETRY_MAX_DELAY, settings.RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class DecorrelatedJitter(RetryPolicy):
+    def delay(self, attempt: int, previous: float) -> float:
+        base = settings.RETRY_BASE_DELAY
+        return min(settings.RETRY_MAX_DELAY, random.uniform(base, max(base, previous) * 3))
+
+
+RETRY_POLICIES = {
+    'fixed': FixedDelay,
+    'exponential': ExponentialBackoff,
+    'decorrelated': DecorrelatedJitter
+}
+
+
+def get_retry_policy(name: str | None = None) -> RetryPolicy:
+    return RETRY_POLICIES.get((name or settings.RETRY_POLICY).lower(), DecorrelatedJitter)()
+
+
+class RetryBudget:
+    def __init__(self):
+        self.retries = 0
+        self.seconds = 0.0
+
+    def reset(self) -> None:
+        self.retries = 0
+        self.seconds = 0.0
+
+    def spend(self, delay: float) -> None:
+        if (
+            self.retries + 1 > settings.RETRY_BUDGET_ATTEMPTS
+            or self.seconds + delay > settings.RETRY_BUDGET_SECONDS
+        ):
+            RETRY_BUDGET_EXHAUSTED.inc()
+            raise RetryBudgetExhausted(
+                f"retry budget spent ({self.retries} retries, {self.seconds:.0f}s waited, next wait {delay:.0f}s)"
+            )
+        self.retries += 1
+        self.seconds += delay
@@ -0,0 +1,173 @@
+import time
+import heapq
+import random
+import asyncio
+import itertools
+
+from pyrogram import Client
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.exceptions import InvalidSession
+from bot.core.tapper import Tapper, process_session
+from bot.core.connection_manager import connection_manager
+from bot.utils.metrics import ACTIVE_SESSIONS, SCHEDULED_SESSIONS, SESSION_CYCLE_DURATION
+
+# Extra time for a cycle to stop on its own deadline before it is cancelled
+CYCLE_TIMEOUT_GRACE = 30
+
+
+class SessionScheduler:
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or settings.MAX_CONCURRENT_SESSIONS
+        self.sessions: dict[str, tuple[Client, str | None]] = {}
+        self.tappers: dict[str, Tapper] = {}
+        self.active_sessions: set[str] = set()
+        self.retiring: set[str] = set()
+        self._heap: list[tuple[float, int, str]] = []
+        self._entries: dict[str, int] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.workers)
+
+    def add_session(self, client: Client, proxy: str | None, delay: float = 0) -> None:
+        if client.name in self.sessions:
+            self.retiring.discard(client.name)
+            return
+        self.sessions[client.name] = (client, proxy)
+        SCHEDULED_SESSIONS.set(len(self.sessions))
+        self.schedule(client.name, delay)
+
+    def schedule(self, session_name: str, delay: float) -> None:
+        entry = self._entries[session_name] = next(self._counter)
+        heapq.heappush(self._heap, (time.monotonic() + max(0, delay), entry, session_name))
+        self._wakeup.set()
+
+    def _log_idle(self, seconds: float) -> None:
+        if self.active_sessions or seconds < 60:
+            return
+        session_name = self._heap[0][2]
+        hours = int(seconds // 3600)
+        minutes = int((seconds % 3600) // 60)
+        logger.info(f"All sessions are sleeping. {session_name} will wake up in {hours}h {minutes}m")
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            wake_at, _, session_name = self._heap[0]
+            delay = wake_at - time.monotonic()
+            if delay > 0:
+                self._log_idle(delay)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, entry, _ = heapq.heappop(self._heap)
+            if self._entries.get(session_name) == entry:
+                await self._queue.put(session_name)
+
+    def get_tapper(self, session_name: str) -> Tapper:
+        tapper = self.tappers.get(session_name)
+        if tapper is None:
+            client, _ = self.sessions[session_name]
+            tapper = self.tappers[session_name] = Tapper(client)
+        return tapper
+
+    async def retire_session(self, session_name: str) -> None:
+        if session_name not in self.sessions:
+            return
+        if session_name in self.active_sessions:
+            self.retiring.add(session_name)
+            logger.info(f"{session_name} | Will be removed after the current cycle")
+            return
+        await self.remove_session(session_name)
+        logger.info(f"{session_name} | Removed from the schedule")
+
+    async def remove_session(self, session_name: str) -> None:
+        session = self.sessions.pop(session_name, None)
+        self._entries.pop(session_name, None)
+        self.retiring.discard(session_name)
+        SCHEDULED_SESSIONS.set(len(self.sessions))
+        if session:
+            await connection_manager.release(session[0])
+        tapper = self.tappers.pop(session_name, None)
+        if tapper:
+            await tapper.close()
+
+    async def _run_cycle(self, session_name: str) -> float | None:
+        _, proxy = self.sessions[session_name]
+        self.active_sessions.add(session_name)
+        ACTIVE_SESSIONS.set(len(self.active_sessions))
+        started = time.monotonic()
+        cycle = process_session(self.get_tapper(session_name), proxy)
+        try:
+            if settings.SESSION_CYCLE_TIMEOUT > 0:
+                return await asyncio.wait_for(cycle, timeout=settings.SESSION_CYCLE_TIMEOUT + CYCLE_TIMEOUT_GRACE)
+            return await cycle
+        except asyncio.TimeoutError:
+            logger.error(f"{session_name} | Cycle ran longer than {settings.SESSION_CYCLE_TIMEOUT}s and was cancelled")
+            return None
+        except InvalidSession:
+            logger.error(f"{session_name} | Session is invalid, removing it from the schedule")
+            await self.remove_session(session_name)
+            return None
+        except Exception as e:
+            logger.error(f"{session_name} | Critical error: {e}")
+            return None
+        finally:
+            self.active_sessions.discard(session_name)
+            ACTIVE_SESSIONS.set(len(self.active_sessions))
+            SESSION_CYCLE_DURATION.observe(time.monotonic() - started)
+
+    async def _worker(self) -> None:
+        while True:
+            session_name = await self._queue.get()
+            try:
+                if session_name not in self.sessions:
+                    continue
+                next_run_in = await self._run_cycle(session_name)
+                if session_name in self.retiring:
+                    await self.remove_session(session_name)
+                    logger.info(f"{session_name} | Removed from the schedule")
+                    continue
+                if session_name not in self.sessions:
+                    continue
+                if next_run_in is None:
+                    next_run_in = random.uniform(settings.RETRY_DELAY[0], settings.RETRY_DELAY[1])
+                    logger.info(f"{session_name} | ⏳ Retrying in {next_run_in:.0f} sec")
+                self.schedule(session_name, next_run_in)
+            finally:
+                self._queue.task_done()
+
+    async def run(self) -> None:
+        if not self.sessions:
+            logger.warning("No active or sleeping sessions found")
+
+        tasks = [asyncio.create_task(self._dispatch())]
+        tasks.extend(asyncio.create_task(self._worker()) for _ in range(self.workers))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*(tapper.close() for tapper in self.tappers.values()), return_exceptions=True)
+            await connection_manager.close()
+
+
+async def run_tappers(tg_clients: list[Client], proxies: list[str | None]):
+    scheduler = SessionScheduler()
+    for client, proxy in zip(tg_clients, proxies):
+        scheduler.add_session(client, proxy)
+    await scheduler.run()
+
+
+async def run_tapper(tg_client: Client, proxy: str | None):
+    await run_tappers([tg_client], [proxy])
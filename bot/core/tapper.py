@@ -1,3 +1,4 @@
+import time
 import random
 import asyncio
 from datetime import datetime, timezone, timedelta
@@ -13,40 +14,86 @@ from pyrogram.errors import (
     FloodWait,
     UserBannedInChannel,
     RPCError,
-    UsernameInvalid
+    UsernameInvalid,
+    PeerIdInvalid,
+    UserIdInvalid,
+    BotInvalid,
+    ChannelInvalid
 )
 from pyrogram.raw.functions.messages import RequestAppWebView
 from pyrogram.raw import types
-from rich.console import Console
 import logging
 
 import aiohttp
 from bot.core.user_agents import load_or_generate_user_agent
-from bot.exceptions import InvalidSession
-from aiohttp import ClientResponseError, ClientSession, ClientTimeout, BasicAuth
-import json
-from aiohttp_socks import ProxyConnector
+from bot.exceptions import InvalidSession, RetryBudgetExhausted, CycleDeadlineExceeded
+from aiohttp import (
+    ClientResponseError, ClientSession, BasicAuth, TCPConnector,
+    ClientProxyConnectionError, ClientHttpProxyError, ClientConnectorError, ServerTimeoutError
+)
+from aiohttp_socks import ProxyConnector, ProxyError, ProxyConnectionError, ProxyTimeoutError
 
 from pyrogram import raw
 from bot.utils.logger import logger
+from bot.utils.decoder import read_response
+from bot.utils.startup import startup
 from bot.config import settings
-from bot.config.config import Settings
 from bot.core.headers import (
     get_headers, 
     get_task_headers,
     get_farming_headers,
     get_auth_headers,
-    get_proxy_check_headers,
     get_referral_headers
 )
+from bot.core.proxy_checker import proxy_checker
+from bot.core.token_store import token_store
+from bot.core.peer_cache import peer_cache
+from bot.core.task_index import TaskIndex
+from bot.core.verification_poller import VerificationPoller
+from bot.core.rate_limiter import rate_limiter
+from bot.core.circuit_breaker import circuit_breakers
+from bot.core.retry_policy import RetryBudget, get_retry_policy, parse_retry_after
+from bot.core.timeouts import (
+    check_deadline,
+    endpoint_class,
+    request_timeout,
+    start_cycle_deadline,
+    reset_cycle_deadline
+)
+from bot.core.connection_manager import connection_manager
+from bot.utils.metrics import (
+    normalize_endpoint,
+    REQUEST_DURATION,
+    REQUEST_ERRORS,
+    REQUEST_RETRIES,
+    RESPONSES
+)
 from rich.table import Table
 
-console = Console()
 
 logging.getLogger("pyrogram").setLevel(logging.WARNING)
 logging.getLogger("pyrogram.session.auth").setLevel(logging.WARNING)
 logging.getLogger("pyrogram.session.session").setLevel(logging.WARNING)
 
+PROXY_ERRORS = (
+    ProxyError,
+    ProxyConnectionError,
+    ProxyTimeoutError,
+    ClientProxyConnectionError,
+    ClientHttpProxyError
+)
+
+# Through a proxy these mean the proxy itself refused or dropped the connection
+CONNECT_ERRORS = PROXY_ERRORS + (ClientConnectorError,)
+
+
+def is_connect_failure(error: BaseException) -> bool:
+    if isinstance(error, CONNECT_ERRORS):
+        return True
+    # aiohttp reports a connect timeout as ServerTimeoutError("Connection timeout to host ..."),
+    # read timeouts use the same type with another message and belong to the API
+    return isinstance(error, ServerTimeoutError) and str(error).startswith('Connection timeout')
+
 def format_number(num):
     if num >= 1_000_000:
         return f"{num/1_000_000:.1f}M"
@@ -55,11 +102,15 @@ def format_number(num):
     else:
         return str(num)
 
+_UNSET = object()
+
+PEER_ERRORS = (PeerIdInvalid, UserIdInvalid, BotInvalid, ChannelInvalid)
+
 class Tapper:
     def __init__(self, tg_client: Client):
         self.session_name = tg_client.name
         self.tg_client = tg_client
-        self.settings = Settings()
+        self.settings = settings
         self.user_id = 0
         self.username = None
         self.first_name = None
@@ -67,6 +118,8 @@ class Tapper:
         self.token = None
         self.refresh_token = None
         self.client_lock = asyncio.Lock()
+        self.auth_lock = asyncio.Lock()
+        self.request_semaphore = None
         self.user_agent = load_or_generate_user_agent(self.session_name)
         self.retry_count = 0
         self.balance = 0
@@ -74,13 +127,55 @@ class Tapper:
         self.referral_code = None
         self.crypton_profile_username = None
         self.ton_wallet = None
+        self.proxy = None
         self.proxy_dict = None
         self.completed_lessons = set()
+        self.task_index = TaskIndex()
+        self.verification_poller = VerificationPoller(self)
+        self.retry_policy = get_retry_policy()
+        self.retry_budget = RetryBudget()
         self.proxy_country = None
+        self.http_session = None
+        self.http_session_proxy = None
 
     def get_headers(self, with_auth: bool = False) -> dict:
         return get_headers(self.user_agent, with_auth, self.token, self.proxy_country)
 
+    def get_proxy_url(self) -> str | None:
+        if not self.proxy_dict:
+            return None
+        if self.proxy_dict.get('username') and self.proxy_dict.get('password'):
+            return f"{self.proxy_dict['scheme']}://{self.proxy_dict['username']}:{self.proxy_dict['password']}@{self.proxy_dict['hostname']}:{self.proxy_dict['port']}"
+        return f"{self.proxy_dict['scheme']}://{self.proxy_dict['hostname']}:{self.proxy_dict['port']}"
+
+    async def get_http_session(self) -> ClientSession:
+        proxy_url = self.get_proxy_url()
+        if self.http_session and not self.http_session.closed:
+            if self.http_session_proxy == proxy_url:
+                return self.http_session
+            await self.http_session.close()
+
+        connector_kwargs = dict(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            ssl=False
+        )
+        if proxy_url:
+            connector = ProxyConnector.from_url(proxy_url, **connector_kwargs)
+        else:
+            connector = TCPConnector(**connector_kwargs)
+
+        self.http_session = ClientSession(connector=connector)
+        self.http_session_proxy = proxy_url
+        return self.http_session
+
+    async def close(self) -> None:
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+        self.http_session = None
+        self.http_session_proxy = None
+
     async def setup_proxy(self, proxy: str | None) -> None:
         if proxy:
             proxy_obj = Proxy.from_str(proxy)
@@ -100,70 +195,72 @@ class Tapper:
             if settings.LOG_PROXY:
                 logger.info(f"{self.session_name} | Proxy not used")
 
+    async def _request_web_view(self, bot_username: str, short_name: str):
+        peer = peer_cache.get_peer(self.session_name, bot_username)
+        cached = peer is not None
+        if not cached:
+            logger.info(f"{self.session_name} | Obtaining peer ID for {bot_username}")
+            peer = await self.tg_client.resolve_peer(bot_username)
+            peer_cache.save_peer(self.session_name, bot_username, peer)
+
+        logger.info(f"{self.session_name} | Requesting web view")
+        try:
+            return await self.tg_client.invoke(RequestAppWebView(
+                peer=peer,
+                app=types.InputBotAppShortName(bot_id=peer, short_name=short_name),
+                platform='android',
+                write_allowed=True,
+                start_param=self.start_param
+            ))
+        except PEER_ERRORS:
+            peer_cache.invalidate_peer(self.session_name, bot_username)
+            if not cached:
+                raise
+            logger.warning(f"{self.session_name} | Cached peer for {bot_username} is no longer valid, resolving again")
+            return await self._request_web_view(bot_username, short_name)
+
     async def get_tg_web_data(self, proxy: str | None) -> str:
         async with self.client_lock:
             logger.info(f"{self.session_name} | Started obtaining tg_web_data")
             await self.setup_proxy(proxy)
 
             try:
-                with_tg = True
                 logger.info(f"{self.session_name} | Checking connection to Telegram")
+                async with connection_manager.connection(self.tg_client):
+                    self.start_param = random.choices([settings.REF_ID, "DTGYWCIWEZSAGUB"], weights=[70, 30], k=1)[0]
+                    if not self.start_param.startswith('ref_'):
+                        self.start_param = f"ref_{self.start_param}"
 
-                if not self.tg_client.is_connected:
-                    with_tg = False
-                    logger.info(f"{self.session_name} | Connecting to Telegram...")
-                    try:
-                        await self.tg_client.connect()
-                        logger.success(f"{self.session_name} | Successfully connected to Telegram")
-                    except (Unauthorized, UserDeactivated, AuthKeyUnregistered):
-                        logger.error(f"{self.session_name} | Session is invalid")
-                        raise InvalidSession(self.session_name)
-                    except Exception as e:
-                        logger.error(f"{self.session_name} | Error connecting to Telegram: {str(e)}")
-                        raise
-
-                self.start_param = random.choices([settings.REF_ID, "DTGYWCIWEZSAGUB"], weights=[70, 30], k=1)[0]
-                if not self.start_param.startswith('ref_'):
-                    self.start_param = f"ref_{self.start_param}"
-
-                logger.info(f"{self.session_name} | Obtaining peer ID for nutsfarm bot")
-                peer = await self.tg_client.resolve_peer('nutsfarm_bot')
-                InputBotApp = types.InputBotAppShortName(bot_id=peer, short_name="nutscoin")
-
-                logger.info(f"{self.session_name} | Requesting web view")
-                web_view = await self.tg_client.invoke(RequestAppWebView(
-                    peer=peer,
-                    app=InputBotApp,
-                    platform='android',
-                    write_allowed=True,
-                    start_param=self.start_param
-                ))
-
-                auth_url = web_view.url
-                logger.info(f"{self.session_name} | Received authorization URL")
-                
-                tg_web_data = unquote(
-                    string=auth_url.split('tgWebAppData=', maxsplit=1)[1].split('&tgWebAppVersion', maxsplit=1)[0])
-                logger.success(f"{self.session_name} | Successfully obtained web view data")
+                    web_view = await self._request_web_view('nutsfarm_bot', 'nutscoin')
 
-                try:
-                    if self.user_id == 0:
-                        logger.info(f"{self.session_name} | Obtaining user information")
-                        information = await self.tg_client.get_me()
-                        self.user_id = information.id
-                        self.first_name = information.first_name or ''
-                        self.last_name = information.last_name or ''
-                        self.username = information.username or ''
-                        logger.info(f"{self.session_name} | User: {self.username} ({self.user_id})")
-                except Exception as e:
-                    logger.warning(f"{self.session_name} | Failed to obtain user information: {str(e)}")
+                    auth_url = web_view.url
+                    logger.info(f"{self.session_name} | Received authorization URL")
+                    
+                    tg_web_data = unquote(
+                        string=auth_url.split('tgWebAppData=', maxsplit=1)[1].split('&tgWebAppVersion', maxsplit=1)[0])
+                    logger.success(f"{self.session_name} | Successfully obtained web view data")
 
-                if not with_tg:
-                    logger.info(f"{self.session_name} | Disconnecting from Telegram")
-                    await self.tg_client.disconnect()
+                    try:
+                        if self.user_id == 0:
+                            information = peer_cache.get_me(self.session_name)
+                            if information is None:
+                                logger.info(f"{self.session_name} | Obtaining user information")
+                                information = await self.tg_client.get_me()
+                                peer_cache.save_me(self.session_name, information)
+                            self.user_id = information.id
+                            self.first_name = information.first_name or ''
+                            self.last_name = information.last_name or ''
+                            self.username = information.username or ''
+                            logger.info(f"{self.session_name} | User: {self.username} ({self.user_id})")
+                    except Exception as e:
+                        logger.warning(f"{self.session_name} | Failed to obtain user information: {str(e)}")
 
                 return tg_web_data
 
+            except (Unauthorized, UserDeactivated, AuthKeyUnregistered):
+                logger.error(f"{self.session_name} | Session is invalid")
+                raise InvalidSession(self.session_name)
+
             except InvalidSession as error:
                 raise error
             except Exception as error:
@@ -175,58 +272,83 @@ class Tapper:
         if not self.proxy_dict:
             self.proxy_country = None
             return True
-            
+
+        status = await proxy_checker.check(self.get_proxy_url(), self.user_agent)
+        if status.country:
+            self.proxy_country = status.country
+        return status.alive
+
+    async def _reauthorize(self, request_token: str | None) -> bool:
+        async with self.auth_lock:
+            if self.token and self.token != request_token:
+                return True
+            if await self.refresh_access_token():
+                return True
+            tg_web_data = await self.get_tg_web_data(self.proxy)
+            return bool(tg_web_data) and await self.authorize(tg_web_data)
+
+    async def gather_limited(self, *coros) -> list:
+        if self.request_semaphore is None:
+            self.request_semaphore = asyncio.Semaphore(max(1, settings.CYCLE_CONCURRENCY))
+
+        async def run(coro):
+            try:
+                async with self.request_semaphore:
+                    return await coro
+            finally:
+                # Cancelled while waiting for a slot, the request coroutine was never started
+                coro.close()
+
+        # RetryBudgetExhausted and CycleDeadlineExceeded abort the cycle, so the other requests stop with it
+        tasks = [asyncio.ensure_future(run(coro)) for coro in coros]
         try:
-            headers = get_proxy_check_headers(self.user_agent)
-            
-            proxy_url = f"{self.proxy_dict['scheme']}://{self.proxy_dict['hostname']}:{self.proxy_dict['port']}"
-            if self.proxy_dict.get('username') and self.proxy_dict.get('password'):
-                proxy_url = f"{self.proxy_dict['scheme']}://{self.proxy_dict['username']}:{self.proxy_dict['password']}@{self.proxy_dict['hostname']}:{self.proxy_dict['port']}"
-            
-            connector = ProxyConnector.from_url(proxy_url)
-                    
-            async with ClientSession(connector=connector) as session:
-                endpoints = [
-                    'http://ip-api.com/json', 
-                    'https://ipinfo.io/json', 
-                    'https://speed.cloudflare.com/meta'
-                ]
-                
-                for endpoint in endpoints:
-                    try:
-                        async with session.get(
-                            endpoint,
-                            headers=headers,
-                            ssl=False,
-                            timeout=ClientTimeout(total=15)
-                        ) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                if 'country' in data:
-                                    self.proxy_country = data['country']
-                                elif 'countryCode' in data:
-                                    self.proxy_country = data['countryCode']
-                                    
-                                if settings.LOG_PROXY_CHECK:
-                                    logger.info(
-                                        f"{self.session_name} | "
-                                        f"Proxy check successful via {endpoint} | "
-                                        f"Country: {self.proxy_country}"
-                                    )
-                                return True
-                    except Exception as e:
-                        if settings.LOG_PROXY_CHECK:
-                            logger.debug(f"{self.session_name} | Failed to check proxy via {endpoint}: {str(e)}")
-                        continue
-                        
-                if settings.LOG_PROXY_CHECK:
-                    logger.warning(f"{self.session_name} | All proxy check endpoints failed")
-                return False
-                
-        except Exception as e:
-            if settings.LOG_PROXY_CHECK:
-                logger.warning(f"{self.session_name} | Proxy check failed: {str(e)}")
-            return False
+            return await asyncio.gather(*tasks)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    async def fetch_cycle_data(self) -> dict:
+        (
+            user_info, streak_info, referral_amount, referral_time,
+            active_stories, current_stories, lessons, tasks, current_tasks
+        ) = await self.gather_limited(
+            self.get_user_info(),
+            self.get_streak_info(),
+            self.get_referral_reward_amount(),
+            self.get_referral_claim_time(),
+            self.get_active_stories(),
+            self.get_current_stories(),
+            self.get_available_lessons(),
+            self.get_active_tasks(),
+            self.get_current_tasks()
+        )
+        return {
+            'user_info': user_info,
+            'streak_info': streak_info,
+            'referral_amount': referral_amount,
+            'referral_time': referral_time,
+            'active_stories': active_stories,
+            'current_stories': current_stories,
+            'lessons': lessons,
+            'tasks': tasks,
+            'current_tasks': current_tasks
+        }
+
+    def _retry_delay(self, attempt: int, previous: float, retry_after: float | None = None) -> float:
+        delay = retry_after if retry_after is not None else self.retry_policy.delay(attempt, previous)
+        check_deadline(delay)
+        self.retry_budget.spend(delay)
+        return delay
+
+    async def _wait_rate_limit(self, host: str, proxy_url: str | None, retry_after: float) -> None:
+        logger.warning(f"{self.session_name} | Rate limit exceeded, waiting {retry_after:.0f} seconds")
+        if settings.RATE_LIMIT_ENABLED:
+            rate_limiter.on_rate_limited(host, proxy_url, retry_after)
+        else:
+            await asyncio.sleep(retry_after)
 
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> dict | None:
         if not self.token and kwargs.pop('with_auth', True):
@@ -249,107 +371,132 @@ class Tapper:
                 kwargs['params']['lang'] = 'EN' if self.proxy_country and self.proxy_country != 'RU' else 'RU'
 
         retry_count = 0
+        attempt = 0
+        delay = 0.0
         auth_retry_count = 0
         max_auth_retries = 2
+        metric_endpoint = normalize_endpoint(endpoint)
+        timeout_class = endpoint_class(endpoint)
+        host = rate_limiter.host_of(url)
         
         while retry_count < settings.MAX_RETRIES:
+            proxy_url = self.get_proxy_url()
+            open_breaker = circuit_breakers.acquire(host, metric_endpoint, proxy_url)
+            if open_breaker:
+                logger.debug(
+                    f"{self.session_name} | Circuit {open_breaker.name} is open, "
+                    f"skipping {endpoint} (retry in {open_breaker.retry_in:.0f}s)"
+                )
+                return None
+
+            settled = False
             try:
-                proxy_url = None
-                if self.proxy_dict:
-                    proxy_url = f"{self.proxy_dict['scheme']}://{self.proxy_dict['hostname']}:{self.proxy_dict['port']}"
-                    if self.proxy_dict.get('username') and self.proxy_dict.get('password'):
-                        proxy_url = f"{self.proxy_dict['scheme']}://{self.proxy_dict['username']}:{self.proxy_dict['password']}@{self.proxy_dict['hostname']}:{self.proxy_dict['port']}"
+                session = await self.get_http_session()
+                await rate_limiter.acquire(host, proxy_url)
+                request_token = self.token
                 
-                connector = ProxyConnector.from_url(proxy_url) if proxy_url else None
+                request_kwargs = {
+                    'url': url,
+                    'headers': headers,
+                    'ssl': False,
+                    'timeout': request_timeout(timeout_class),
+                    **kwargs
+                }
                 
-                async with ClientSession(connector=connector) as session:
-                    timeout = random.uniform(settings.REQUEST_TIMEOUT[0], settings.REQUEST_TIMEOUT[1])
-                    
-                    request_kwargs = {
-                        'url': url,
-                        'headers': headers,
-                        'ssl': False,
-                        'timeout': ClientTimeout(total=timeout),
-                        **kwargs
-                    }
-                    
-                    async with getattr(session, method.lower())(**request_kwargs) as response:
-                        if response.status in [401, 403]:
-                            if auth_retry_count < max_auth_retries:
-                                auth_retry_count += 1
-                                if await self.refresh_access_token():
-                                    headers = self.get_headers(with_auth=True)
-                                    request_kwargs['headers'] = headers
-                                    continue
-                                else:
-                                    tg_web_data = await self.get_tg_web_data(None)
-                                    if tg_web_data and await self.authorize(tg_web_data):
-                                        headers = self.get_headers(with_auth=True)
-                                        request_kwargs['headers'] = headers
-                                        continue
-                            logger.error(f"{self.session_name} | Authorization failed after {auth_retry_count} attempts")
+                started = time.perf_counter()
+                async with getattr(session, method.lower())(**request_kwargs) as response:
+                    REQUEST_DURATION.observe(time.perf_counter() - started, endpoint=metric_endpoint)
+                    RESPONSES.inc(endpoint=metric_endpoint, status=response.status)
+                    circuit_breakers.record(
+                        host, metric_endpoint, proxy_url, endpoint_ok=response.status < 500, proxy_ok=True
+                    )
+                    settled = True
+
+                    if response.status in [401, 403]:
+                        if endpoint == 'auth/token':
                             return None
-                                
-                        if response.status == 429: 
-                            retry_after = int(response.headers.get('Retry-After', 60))
-                            logger.warning(f"{self.session_name} | Rate limit exceeded, waiting {retry_after} seconds")
-                            await asyncio.sleep(retry_after)
-                            continue
+                        if auth_retry_count < max_auth_retries:
+                            auth_retry_count += 1
+                            REQUEST_RETRIES.inc(endpoint=metric_endpoint, reason='auth')
+                            if await self._reauthorize(request_token):
+                                headers = self.get_headers(with_auth=True)
+                                continue
+                        logger.error(f"{self.session_name} | Authorization failed after {auth_retry_count} attempts")
+                        return None
                             
-                        response.raise_for_status()
-                        
-                        if response.status == 204:
-                            return {}
-                            
-                        content_type = response.headers.get('Content-Type', '')
+                    if response.status == 429: 
+                        REQUEST_RETRIES.inc(endpoint=metric_endpoint, reason='rate_limit')
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        delay = self._retry_delay(attempt, delay, retry_after)
+                        attempt += 1
+                        await self._wait_rate_limit(host, proxy_url, delay)
+                        continue
                         
-                        if 'application/json' in content_type:
-                            return await response.json()
-                        elif 'text/plain' in content_type:
-                            text = await response.text()
-                            try:
-                                return json.loads(text)
-                            except json.JSONDecodeError:
-                                try:
-                                    return float(text)
-                                except ValueError:
-                                    return text
-                        else:
-                            try:
-                                return await response.json()
-                            except:
-                                text = await response.text()
-                                try:
-                                    return json.loads(text)
-                                except:
-                                    try:
-                                        return float(text)
-                                    except:
-                                        return text
+                    response.raise_for_status()
+                    rate_limiter.on_success(host, proxy_url)
+                    
+                    if response.status == 204:
+                        return {}
                         
+                    return await read_response(response)
+                    
             except ClientResponseError as error:
+                if not settled:
+                    # ClientHttpProxyError: the proxy rejected the connection before the API was reached
+                    circuit_breakers.record(host, metric_endpoint, proxy_url, endpoint_ok=None, proxy_ok=False)
+                    settled = True
+                    if proxy_url:
+                        proxy_checker.invalidate(proxy_url)
+
                 if error.status == 429:  
-                    retry_after = int(error.headers.get('Retry-After', 60))
-                    logger.warning(f"{self.session_name} | Rate limit exceeded, waiting {retry_after} seconds")
-                    await asyncio.sleep(retry_after)
+                    REQUEST_RETRIES.inc(endpoint=metric_endpoint, reason='rate_limit')
+                    retry_after = parse_retry_after(error.headers.get('Retry-After') if error.headers else None)
+                    delay = self._retry_delay(attempt, delay, retry_after)
+                    attempt += 1
+                    await self._wait_rate_limit(host, proxy_url, delay)
                     continue
                     
                 retry_count += 1
                 if retry_count < settings.MAX_RETRIES:
-                    delay = random.uniform(settings.RETRY_DELAY[0], settings.RETRY_DELAY[1])
+                    REQUEST_RETRIES.inc(endpoint=metric_endpoint, reason='http_error')
+                    delay = self._retry_delay(attempt, delay)
+                    attempt += 1
                     logger.warning(f"{self.session_name} | Error {error.status}, retrying in {delay:.1f} sec...")
                     await asyncio.sleep(delay)
                 else:
                     logger.error(f"{self.session_name} | Request failed after {settings.MAX_RETRIES} attempts")
                     return None
             except Exception as error:
+                if isinstance(error, asyncio.TimeoutError):
+                    # The total timeout is clamped to the cycle deadline; hitting that is not the server's fault
+                    check_deadline()
+                REQUEST_ERRORS.inc(endpoint=metric_endpoint, error=type(error).__name__)
+                # A response that failed to decode was already recorded when its status arrived
+                if not settled:
+                    proxy_failed = bool(proxy_url) and is_connect_failure(error)
+                    circuit_breakers.record(
+                        host,
+                        metric_endpoint,
+                        proxy_url,
+                        endpoint_ok=None if proxy_failed else False,
+                        proxy_ok=False if proxy_failed else None
+                    )
+                    settled = True
+                    if proxy_failed:
+                        proxy_checker.invalidate(proxy_url)
                 retry_count += 1
                 if retry_count < settings.MAX_RETRIES:
-                    delay = random.uniform(settings.RETRY_DELAY[0], settings.RETRY_DELAY[1])
+                    REQUEST_RETRIES.inc(endpoint=metric_endpoint, reason='error')
+                    delay = self._retry_delay(attempt, delay)
+                    attempt += 1
                     await asyncio.sleep(delay)
                 else:
                     logger.error(f"{self.session_name} | Request failed after {settings.MAX_RETRIES} attempts")
                     return None
+            finally:
+                # Cancelled or aborted requests give back their half-open trial slot
+                if not settled:
+                    circuit_breakers.record(host, metric_endpoint, proxy_url, endpoint_ok=None, proxy_ok=None)
 
     def _get_language(self) -> str:
         return 'EN' if self.proxy_country and self.proxy_country != 'RU' else 'RU'
@@ -371,17 +518,24 @@ class Tapper:
             )
         return data
 
-    async def get_tasks(self) -> list | None:
-        tasks = await self._make_request('GET', 'task/active', params={'lang': self._get_language()})
+    async def get_active_tasks(self) -> list | None:
+        return await self._make_request('GET', 'task/active', params={'lang': self._get_language()})
+
+    async def get_tasks(self, tasks=_UNSET, current_tasks=_UNSET) -> list | None:
+        if tasks is _UNSET:
+            tasks = await self.get_active_tasks()
         if not tasks:
             return None
             
         logger.success(f"{self.session_name} | Found {len(tasks)} total tasks")
         
-        current_tasks = await self.get_current_tasks()
-        claimed_task_ids = []
+        if current_tasks is _UNSET:
+            current_tasks = await self.get_current_tasks()
+        self.task_index = TaskIndex(tasks, current_tasks)
+        claimed_task_ids = set()
         verified_tasks = []
-        verifying_task_ids = []
+        verified_task_ids = set()
+        verifying_task_ids = {}
         
         if current_tasks:
             for current_task in current_tasks:
@@ -389,17 +543,18 @@ class Tapper:
                 status = current_task['status']
                 
                 if status == 'CLAIMED':
-                    claimed_task_ids.append(task_id)
+                    claimed_task_ids.add(task_id)
                 elif status == 'COMPLETED':
-                    original_task = next((t for t in tasks if t['task']['id'] == task_id), None)
+                    original_task = self.task_index.task(task_id)
                     if original_task:
                         verified_tasks.append({
                             **original_task,
                             'id': current_task['id'],
                             'status': 'COMPLETED'
                         })
+                        verified_task_ids.add(task_id)
                 elif status == 'VERIFYING':
-                    verifying_task_ids.append(task_id)
+                    verifying_task_ids[task_id] = current_task['id']
         
         filtered_tasks = []
         learn_tasks = []
@@ -441,10 +596,11 @@ class Tapper:
             if task_id in claimed_task_ids:
                 continue
                 
-            if task_id in [t['task']['id'] for t in verified_tasks]:
+            if task_id in verified_task_ids:
                 continue
                 
             if task_id in verifying_task_ids:
+                self.verification_poller.watch(verifying_task_ids[task_id], task)
                 table.add_row(
                     str(task_number),
                     title,
@@ -519,7 +675,7 @@ class Tapper:
         else:
             logger.info(f"{self.session_name} | No tasks to complete")
             
-        console.print(table)
+        logger.print(table)
             
         return filtered_tasks
 
@@ -556,8 +712,6 @@ class Tapper:
         return False
 
     async def join_telegram_channel(self, channel_id: int, channel_url: str) -> bool:
-        was_connected = self.tg_client.is_connected
-        
         if not settings.ENABLE_CHANNEL_SUBSCRIPTIONS:
             logger.warning(f"{self.session_name} | Channel subscriptions are disabled in settings")
             return False
@@ -565,20 +719,18 @@ class Tapper:
         try:
             logger.info(f"{self.session_name} | Subscribing to channel {channel_url}")
             
-            if not was_connected:
-                logger.info(f"{self.session_name} | Connecting to Telegram...")
-                await self.tg_client.connect()
-
-            try:
+            async with connection_manager.connection(self.tg_client):
                 if 'short.trustwallet.com' in channel_url or ('t.me/' not in channel_url and 'telegram.me/' not in channel_url):
-                    async with ClientSession() as session:
-                        async with session.get(channel_url, allow_redirects=True, ssl=False) as response:
-                            if response.status == 200:
-                                text = await response.text()
-                                if 'tg://resolve?domain=' in text:
-                                    channel_username = text.split('tg://resolve?domain=')[1].split('"')[0]
-                                    logger.info(f"{self.session_name} | Found Telegram channel: {channel_username}")
-                                    channel_url = f"https://t.me/{channel_username}"
+                    session = await self.get_http_session()
+                    async with session.get(
+                        channel_url, allow_redirects=True, ssl=False, timeout=request_timeout('external')
+                    ) as response:
+                        if response.status == 200:
+                            text = await read_response(response)
+                            if isinstance(text, str) and 'tg://resolve?domain=' in text:
+                                channel_username = text.split('tg://resolve?domain=')[1].split('"')[0]
+                                logger.info(f"{self.session_name} | Found Telegram channel: {channel_username}")
+                                channel_url = f"https://t.me/{channel_username}"
             
                 channel_username = channel_url.split('/')[-1]
                 
@@ -604,13 +756,9 @@ class Tapper:
                     logger.error(f"{self.session_name} | Error while subscribing: {str(e)}")
                     return False
                     
-            except Exception as e:
-                logger.error(f"{self.session_name} | Error while subscribing to channel: {str(e)}")
-                return False
-
-        finally:
-            if not was_connected and self.tg_client.is_connected:
-                await self.tg_client.disconnect()
+        except Exception as e:
+            logger.error(f"{self.session_name} | Error while subscribing to channel: {str(e)}")
+            return False
 
     async def _mute_and_archive_channel(self, channel_id: int) -> None:
         try:
@@ -655,54 +803,35 @@ class Tapper:
         if task_type == 'TELEGRAM_CHANNEL_SUBSCRIPTION' and telegram_channel_id:
             data["telegramChannelId"] = telegram_channel_id
             
-        if task_type == 'LEARN_LESSON':
-            result = await self._make_request(
-                'POST',
-                'task/verify',
-                headers=get_task_headers(self.proxy_country),
-                json=data
-            )
-            
-            if result:
-                status = result.get('status')
-                if status in ['VERIFYING', 'FARMING', 'COMPLETED']:
-                    for attempt in range(3):
-                        await asyncio.sleep(5)
-                        current_tasks = await self.get_current_tasks()
-                        if not current_tasks:
-                            continue
-                            
-                        current_task = next((t for t in current_tasks if t['id'] == user_task_id), None)
-                        if not current_task:
-                            continue
-                            
-                        current_status = current_task.get('status')
-                        logger.info(f"{self.session_name} | Verification status: {current_status}")
-                        
-                        if current_status == 'COMPLETED':
-                            return True
-                            
-                    return False
-                    
-                logger.error(f"{self.session_name} | Verification failed: {status}")
-                return False
-                
-        else:
-            result = await self._make_request(
-                'POST',
-                'task/verify',
-                headers=get_task_headers(self.proxy_country),
-                json=data
-            )
-            
-            if result:
-                status = result.get('status')
-                if status in ['VERIFYING', 'FARMING', 'COMPLETED']:
-                    return True
-                logger.error(f"{self.session_name} | Verification failed: {status}")
+        result = await self._make_request(
+            'POST',
+            'task/verify',
+            headers=get_task_headers(self.proxy_country),
+            json=data
+        )
+        
+        if result:
+            self.task_index.update(result)
+            status = result.get('status')
+            if status in ['VERIFYING', 'FARMING', 'COMPLETED']:
+                return True
+            logger.error(f"{self.session_name} | Verification failed: {status}")
                 
         return False
 
+    async def _claim_or_watch(self, completion_id: str, task: dict) -> bool:
+        user_task = self.task_index.get_completion(completion_id)
+        if not user_task or user_task.get('status') != 'COMPLETED':
+            self.verification_poller.watch(completion_id, task)
+            return False
+
+        received_reward = await self.claim_task_reward(completion_id)
+        if received_reward > 0:
+            logger.success(f"{self.session_name} | Received {received_reward} NUTS")
+            await asyncio.sleep(random.uniform(8, 12))
+            return True
+        return False
+
     async def complete_task(self, task: dict) -> bool:
         task_info = task['task']
         task_type = task_info['type']
@@ -712,57 +841,26 @@ class Tapper:
 
         logger.info(f"{self.session_name} | Task: {title} | {task_type} | {reward} NUTS")
         
-        current_tasks = await self.get_current_tasks()
-        if current_tasks:
-            current_task = next((t for t in current_tasks if t['taskId'] == task_id), None)
-            if current_task:
-                status = current_task['status']
-                logger.info(f"{self.session_name} | Current task status: {status}")
+        current_task = self.task_index.get(task_id)
+        if current_task:
+            status = current_task['status']
+            logger.info(f"{self.session_name} | Current task status: {status}")
+            
+            if status == 'CLAIMED':
+                logger.info(f"{self.session_name} | Task already claimed")
+                return True
                 
-                if status == 'CLAIMED':
-                    logger.info(f"{self.session_name} | Task already claimed")
-                    return True
-                    
-                elif status == 'COMPLETED':
-                    received_reward = await self.claim_task_reward(current_task['id'])
-                    if received_reward > 0:
-                        logger.success(f"{self.session_name} | Received {received_reward} NUTS")
-                        await asyncio.sleep(random.uniform(8, 12))
-                        return True
-                    return False
-                    
-                elif status == 'VERIFYING':
-                    logger.info(f"{self.session_name} | Task is being verified")
-                    for attempt in range(3):
-                        await asyncio.sleep(5)
-                        updated_tasks = await self.get_current_tasks()
-                        if not updated_tasks:
-                            continue
-                            
-                        updated_task = next((t for t in updated_tasks if t['taskId'] == task_id), None)
-                        if not updated_task:
-                            continue
-                            
-                        updated_status = updated_task.get('status')
-                        logger.info(f"{self.session_name} | Updated task status: {updated_status}")
-                        
-                        if updated_status == 'COMPLETED':
-                            received_reward = await self.claim_task_reward(updated_task['id'])
-                            if received_reward > 0:
-                                logger.success(f"{self.session_name} | Received {received_reward} NUTS")
-                                await asyncio.sleep(random.uniform(8, 12))
-                                return True
-                        elif updated_status == 'CLAIMED':
-                            return True
-                            
-                    logger.error(f"{self.session_name} | Verification timeout")
+            elif status == 'COMPLETED':
+                return await self._claim_or_watch(current_task['id'], task)
+                
+            elif status == 'VERIFYING':
+                self.verification_poller.watch(current_task['id'], task)
+                return False
+                
+            elif status == 'PENDING':
+                if not await self.verify_task(current_task['id'], task_type, task.get('telegramChannelId')):
                     return False
-                    
-                elif status == 'PENDING':
-                    if not await self.verify_task(current_task['id'], task_type, task.get('telegramChannelId')):
-                        return False
-                    await asyncio.sleep(random.uniform(5, 8))
-                    return True
+                return await self._claim_or_watch(current_task['id'], task)
 
         completion_id = await self.start_task(task_id, task_type)
         if not completion_id:
@@ -777,14 +875,16 @@ class Tapper:
                 
             if 'short.trustwallet.com' in url or 't.me/' in url:
                 try:
-                    async with ClientSession() as session:
-                        async with session.get(url, allow_redirects=True, ssl=False) as response:
-                            if response.status == 200:
-                                text = await response.text()
-                                if 'tg://resolve?domain=' in text:
-                                    channel_username = text.split('tg://resolve?domain=')[1].split('"')[0]
-                                    if not await self.join_telegram_channel(None, f"https://t.me/{channel_username}"):
-                                        return False
+                    session = await self.get_http_session()
+                    async with session.get(
+                        url, allow_redirects=True, ssl=False, timeout=request_timeout('external')
+                    ) as response:
+                        if response.status == 200:
+                            text = await read_response(response)
+                            if isinstance(text, str) and 'tg://resolve?domain=' in text:
+                                channel_username = text.split('tg://resolve?domain=')[1].split('"')[0]
+                                if not await self.join_telegram_channel(None, f"https://t.me/{channel_username}"):
+                                    return False
                 except Exception as e:
                     logger.error(f"{self.session_name} | URL task error: {str(e)}")
                     return False
@@ -812,13 +912,7 @@ class Tapper:
             
         await asyncio.sleep(random.uniform(5, 8))
         
-        received_reward = await self.claim_task_reward(completion_id)
-        if received_reward > 0:
-            logger.success(f"{self.session_name} | Received {received_reward} NUTS")
-            await asyncio.sleep(random.uniform(8, 12))
-            return True
-            
-        return False
+        return await self._claim_or_watch(completion_id, task)
 
     async def start_task(self, task_id: str, task_type: str) -> str | None:
         data = {
@@ -837,6 +931,7 @@ class Tapper:
         if result:
             completion_id = result.get('id')
             if completion_id:
+                self.task_index.update(result, task_id)
                 return completion_id
         return None
 
@@ -871,6 +966,7 @@ class Tapper:
         )
         
         if isinstance(result, dict):
+            self.task_index.update(result)
             task = result.get('task', {})
             reward = task.get('reward', 0)
             if reward > 0:
@@ -885,36 +981,48 @@ class Tapper:
     async def get_current_tasks(self) -> list | None:
         return await self._make_request('GET', 'task/current')
 
+    async def refresh_current_tasks(self) -> bool:
+        current_tasks = await self.get_current_tasks()
+        if not current_tasks:
+            return False
+        for user_task in current_tasks:
+            self.task_index.update(user_task)
+        return True
+
     async def login(self, auth_data: str) -> bool:
-        settings = Settings()
         url = f"{settings.BASE_URL}api/{settings.API_VERSION}/auth/login"
         headers = self.get_headers()
         headers['content-type'] = 'text/plain;charset=UTF-8'
         
         try:
-            async with ClientSession() as session:
-                async with session.post(
-                    url=url,
-                    headers=headers,
-                    data=auth_data,
-                    ssl=False
-                ) as response:
-                    if response.status == 404:
-                        logger.info(f"{self.session_name} | Account not found, registration required")
-                        return False
-                        
-                    response.raise_for_status()
-                    auth_result = await response.json()
+            session = await self.get_http_session()
+            started = time.perf_counter()
+            async with session.post(
+                url=url,
+                headers=headers,
+                data=auth_data,
+                ssl=False,
+                timeout=request_timeout('auth')
+            ) as response:
+                REQUEST_DURATION.observe(time.perf_counter() - started, endpoint='auth/login')
+                RESPONSES.inc(endpoint='auth/login', status=response.status)
+                if response.status == 404:
+                    logger.info(f"{self.session_name} | Account not found, registration required")
+                    return False
+                    
+                response.raise_for_status()
+                auth_result = await read_response(response)
+                
+                if isinstance(auth_result, dict) and auth_result.get('accessToken'):
+                    self.token = auth_result['accessToken']
+                    self.refresh_token = auth_result.get('refreshToken')
+                    token_store.save(self.session_name, self.token, self.refresh_token)
+                    logger.success(f"{self.session_name} | Successful authorization")
+                    return True
+                else:
+                    logger.error(f"{self.session_name} | Authorization error: invalid response format")
+                    return False
                     
-                    if auth_result.get('accessToken'):
-                        self.token = auth_result['accessToken']
-                        self.refresh_token = auth_result.get('refreshToken')
-                        logger.success(f"{self.session_name} | Successful authorization")
-                        return True
-                    else:
-                        logger.error(f"{self.session_name} | Authorization error: invalid response format")
-                        return False
-                        
         except Exception as error:
             logger.error(f"{self.session_name} | Error during authorization: {str(error)}")
             return False
@@ -934,13 +1042,13 @@ class Tapper:
         if result and result.get('accessToken'):
             self.token = result['accessToken']
             self.refresh_token = result.get('refreshToken')
+            token_store.save(self.session_name, self.token, self.refresh_token)
             logger.success(f"{self.session_name} | Token successfully refreshed")
             return True
             
         return False
 
     async def register(self, auth_data: str, referral_code: str = None) -> bool:
-        settings = Settings()
         base_url = settings.BASE_URL.rstrip('/')
         url = f"{base_url}/api/{settings.API_VERSION}/auth/register"
         headers = self.get_headers()
@@ -965,25 +1073,30 @@ class Tapper:
             data["referralCode"] = referral_code.replace('ref_', '')
             
         try:
-            async with ClientSession() as session:
-                async with session.post(
-                    url=url,
-                    headers=headers,
-                    json=data,
-                    ssl=False
-                ) as response:
-                    response.raise_for_status()
-                    auth_result = await response.json()
+            session = await self.get_http_session()
+            started = time.perf_counter()
+            async with session.post(
+                url=url,
+                headers=headers,
+                json=data,
+                ssl=False,
+                timeout=request_timeout('auth')
+            ) as response:
+                REQUEST_DURATION.observe(time.perf_counter() - started, endpoint='auth/register')
+                RESPONSES.inc(endpoint='auth/register', status=response.status)
+                response.raise_for_status()
+                auth_result = await read_response(response)
+                
+                if isinstance(auth_result, dict) and auth_result.get('accessToken'):
+                    self.token = auth_result['accessToken']
+                    self.refresh_token = auth_result.get('refreshToken')
+                    token_store.save(self.session_name, self.token, self.refresh_token)
+                    logger.success(f"{self.session_name} | Successful registration")
+                    return True
+                else:
+                    logger.error(f"{self.session_name} | Registration error: invalid response format")
+                    return False
                     
-                    if auth_result.get('accessToken'):
-                        self.token = auth_result['accessToken']
-                        self.refresh_token = auth_result.get('refreshToken')
-                        logger.success(f"{self.session_name} | Successful registration")
-                        return True
-                    else:
-                        logger.error(f"{self.session_name} | Registration error: invalid response format")
-                        return False
-                        
         except ClientResponseError as error:
             logger.error(f"{self.session_name} | Registration error: {error.status}")
             return False
@@ -991,18 +1104,46 @@ class Tapper:
             logger.error(f"{self.session_name} | Registration error")
             return False
 
+    async def restore_tokens(self, proxy: str | None) -> bool:
+        entry = token_store.get(self.session_name)
+        if not entry:
+            return False
+
+        await self.setup_proxy(proxy)
+
+        if token_store.is_access_valid(entry):
+            self.token = entry['access_token']
+            self.refresh_token = entry.get('refresh_token')
+            logger.info(f"{self.session_name} | Using saved access token")
+            return True
+
+        if token_store.is_refresh_valid(entry):
+            self.refresh_token = entry['refresh_token']
+            if await self.refresh_access_token():
+                return True
+
+        logger.info(f"{self.session_name} | Saved tokens expired, re-authorizing via Telegram")
+        token_store.clear(self.session_name)
+        self.token = None
+        self.refresh_token = None
+        return False
+
     async def authorize(self, auth_data: str, referral_code: str = None) -> bool:
         if await self.login(auth_data):
             return True
             
         return await self.register(auth_data, referral_code)
 
-    async def check_and_claim_streak(self) -> bool:
-        streak_info = await self._make_request(
+    async def get_streak_info(self) -> dict | None:
+        return await self._make_request(
             'GET',
             'streak/current/info',
             params={'timezone': 'Europe/Moscow'}
         )
+
+    async def check_and_claim_streak(self, streak_info=_UNSET) -> bool:
+        if streak_info is _UNSET:
+            streak_info = await self.get_streak_info()
         
         if not streak_info:
             return False
@@ -1095,12 +1236,14 @@ class Tapper:
             return int(result)
         return None
 
-    async def process_stories(self) -> None:
-        active_stories = await self.get_active_stories()
+    async def process_stories(self, active_stories=_UNSET, current_stories=_UNSET) -> None:
+        if active_stories is _UNSET:
+            active_stories = await self.get_active_stories()
         if not active_stories:
             return
 
-        current_stories = await self.get_current_stories()
+        if current_stories is _UNSET:
+            current_stories = await self.get_current_stories()
         completed_story_ids = []
         
         if current_stories:
@@ -1135,13 +1278,11 @@ class Tapper:
             'user/current/referrals/time',
             headers=get_referral_headers(self.proxy_country)
         )
-        if isinstance(result, str):
-            try:
-                claim_time = datetime.fromisoformat(result.replace('Z', '+00:00'))
-                logger.info(f"{self.session_name} | Referral reward claim time: {claim_time}")
-                return claim_time
-            except ValueError:
-                logger.error(f"{self.session_name} | Invalid claim time format: {result}")
+        if isinstance(result, datetime):
+            logger.info(f"{self.session_name} | Referral reward claim time: {result}")
+            return result
+        if result is not None:
+            logger.error(f"{self.session_name} | Invalid claim time format: {result}")
         return None
     
     async def claim_referral_reward(self) -> float | None:
@@ -1155,14 +1296,16 @@ class Tapper:
             return float(result)
         return None
     
-    async def check_and_claim_referral_reward(self) -> bool:
+    async def check_and_claim_referral_reward(self, reward_amount=_UNSET, claim_time=_UNSET) -> bool:
         try:
-            reward_amount = await self.get_referral_reward_amount()
+            if reward_amount is _UNSET:
+                reward_amount = await self.get_referral_reward_amount()
             if not reward_amount or reward_amount <= 0:
                 logger.info(f"{self.session_name} | No referral reward available")
                 return False
                 
-            claim_time = await self.get_referral_claim_time()
+            if claim_time is _UNSET:
+                claim_time = await self.get_referral_claim_time()
             if not claim_time:
                 return False
                 
@@ -1234,8 +1377,9 @@ class Tapper:
             return reward
         return 0
 
-    async def process_lessons(self) -> None:
-        available_lessons = await self.get_available_lessons()
+    async def process_lessons(self, available_lessons=_UNSET) -> None:
+        if available_lessons is _UNSET:
+            available_lessons = await self.get_available_lessons()
         if not available_lessons:
             logger.info(f"{self.session_name} | No available lessons")
             return
@@ -1269,166 +1413,131 @@ class Tapper:
                 f"Total reward: {total_reward}"
             )
             
-async def run_tappers(tg_clients: list[Client], proxies: list[str | None]):
-    session_sleep_times = {}
-    active_sessions = set()
-    
-    while True:
-        try:
-            current_time = datetime.now(timezone.utc)
-            sessions_to_run = []
-            
-            for client, proxy in zip(tg_clients, proxies):
-                session_name = client.name
-                
-                if session_name in session_sleep_times:
-                    wake_time = session_sleep_times[session_name]
-                    if current_time < wake_time:
-                        time_left = (wake_time - current_time).total_seconds()
-                        hours = int(time_left // 3600)
-                        minutes = int((time_left % 3600) // 60)
-                        logger.info(f"{session_name} | Still sleeping for {hours}h {minutes}m")
-                        continue
-                    else:
-                        logger.info(f"{session_name} | Waking up from sleep")
-                        session_sleep_times.pop(session_name)
-                        active_sessions.add(session_name)
-                        sessions_to_run.append((client, proxy))
-                else:
-                    active_sessions.add(session_name)
-                    sessions_to_run.append((client, proxy))
-
-            for client, proxy in sessions_to_run:
-                tapper = Tapper(client)
-                try:
-                    logger.info(f"{'='*50}")
-                    logger.info(f"Processing session: {tapper.session_name}")
-
-                    tg_web_data = await tapper.get_tg_web_data(proxy)
-                    if not tg_web_data:
-                        logger.error(f"{tapper.session_name} | Failed to get authorization data")
-                        continue
-
-                    if not await tapper.authorize(tg_web_data):
-                        logger.error(f"{tapper.session_name} | Authorization error")
-                        continue
+def _log_next_run(session_name: str, seconds_left: float) -> None:
+    next_run = datetime.now(timezone.utc) + timedelta(seconds=seconds_left + 60)
+    hours = int(seconds_left // 3600)
+    minutes = int((seconds_left % 3600) // 60)
+    logger.info(f"{session_name} | Going to sleep for {hours}h {minutes}m")
+    logger.info(f"{session_name} | Next run scheduled at {next_run.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+
+async def process_session(tapper: Tapper, proxy: str | None) -> float | None:
+    next_run_in = None
+    tapper.proxy = proxy
+    tapper.retry_budget.reset()
+    deadline = start_cycle_deadline(settings.SESSION_CYCLE_TIMEOUT)
+    try:
+        logger.info(f"{'='*50}")
+        logger.info(f"Processing session: {tapper.session_name}")
+
+        if not await tapper.restore_tokens(proxy):
+            tg_web_data = await tapper.get_tg_web_data(proxy)
+            if not tg_web_data:
+                logger.error(f"{tapper.session_name} | Failed to get authorization data")
+                return None
 
-                    initial_balance = 0
-                    user_info = await tapper.get_user_info()
-                    if user_info:
-                        initial_balance = tapper.balance
-                        logger.info(f"{tapper.session_name} | Initial balance: {initial_balance}")
-                        
-                        if not user_info.get('isStartBonusClaimed'):
-                            if await tapper.claim_start_bonus():
-                                logger.success(f"{tapper.session_name} | Start bonus claimed")
-                    
-                    if await tapper.check_and_claim_streak():
-                        logger.success(f"{tapper.session_name} | Streak reward claimed")
+            if not await tapper.authorize(tg_web_data):
+                logger.error(f"{tapper.session_name} | Authorization error")
+                return None
 
-                    if await tapper.check_and_claim_referral_reward():
-                        logger.success(f"{tapper.session_name} | Referral reward claimed")
+        startup.report("first session authorized")
 
-                    await tapper.process_stories()
-                    
-                    await tapper.process_lessons()
-                    
-                    completed_tasks = 0
-                    total_rewards = 0
-                    
-                    tasks = await tapper.get_tasks()
-                    if tasks:
-                        for task in tasks:
-                            if await tapper.complete_task(task):
-                                completed_tasks += 1
-                                total_rewards += task['task']['reward']
-                                delay = random.uniform(5, 10)
-                                logger.info(f"{tapper.session_name} | Waiting {delay:.1f} sec...")
-                                await asyncio.sleep(delay)
-                    
-                    farming_status = await tapper.get_farming_status()
-                    if farming_status:
-                        status = farming_status.get('status')
-                        seconds_left = farming_status.get('seconds_left', 0)
-                        
-                        if status == 'FARMING' and seconds_left > 0:
-                            next_run = current_time + timedelta(seconds=seconds_left + 60)
-                            session_sleep_times[tapper.session_name] = next_run
-                            if tapper.session_name in active_sessions:
-                                active_sessions.remove(tapper.session_name)
-                            hours = int(seconds_left // 3600)
-                            minutes = int((seconds_left % 3600) // 60)
-                            logger.info(f"{tapper.session_name} | Going to sleep for {hours}h {minutes}m")
-                            logger.info(f"{tapper.session_name} | Next run scheduled at {next_run.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-                        elif status == 'READY_TO_FARM':
-                            if await tapper.farm():
-                                logger.success(f"{tapper.session_name} | Farming started")
-                                updated_status = await tapper.get_farming_status()
-                                if updated_status and updated_status.get('seconds_left', 0) > 0:
-                                    seconds_left = updated_status['seconds_left']
-                                    next_run = current_time + timedelta(seconds=seconds_left + 60)
-                                    session_sleep_times[tapper.session_name] = next_run
-                                    if tapper.session_name in active_sessions:
-                                        active_sessions.remove(tapper.session_name)
-                                    hours = int(seconds_left // 3600)
-                                    minutes = int((seconds_left % 3600) // 60)
-                                    logger.info(f"{tapper.session_name} | Going to sleep for {hours}h {minutes}m")
-                                    logger.info(f"{tapper.session_name} | Next run scheduled at {next_run.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-                        else:
-                            if await tapper.claim_farming_reward():
-                                logger.success(f"{tapper.session_name} | Farming reward claimed")
-                                if await tapper.farm():
-                                    logger.success(f"{tapper.session_name} | Farming started")
-                                    updated_status = await tapper.get_farming_status()
-                                    if updated_status and updated_status.get('seconds_left', 0) > 0:
-                                        seconds_left = updated_status['seconds_left']
-                                        next_run = current_time + timedelta(seconds=seconds_left + 60)
-                                        session_sleep_times[tapper.session_name] = next_run
-                                        if tapper.session_name in active_sessions:
-                                            active_sessions.remove(tapper.session_name)
-                                        hours = int(seconds_left // 3600)
-                                        minutes = int((seconds_left % 3600) // 60)
-                                        logger.info(f"{tapper.session_name} | Going to sleep for {hours}h {minutes}m")
-                                        logger.info(f"{tapper.session_name} | Next run scheduled at {next_run.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-
-                    final_balance = initial_balance
-                    user_info = await tapper.get_user_info()
-                    if user_info:
-                        final_balance = tapper.balance
-                    
-                    logger.info(f"\n{tapper.session_name} | Summary:")
-                    logger.info(f"├── Completed tasks: {completed_tasks}")
-                    logger.info(f"├── Total rewards: {total_rewards}")
-                    logger.info(f"├── Initial balance: {initial_balance}")
-                    logger.info(f"── Final balance: {final_balance}")
-                    logger.info(f"└── Gain: {final_balance - initial_balance}")
+        cycle_data = await tapper.fetch_cycle_data() if settings.CONCURRENT_CYCLE else {}
 
-                except Exception as e:
-                    logger.error(f"{tapper.session_name} | Unexpected error: {e}")
-                finally:
-                    logger.info(f"Session processing completed: {tapper.session_name}")
-                    logger.info(f"{'='*50}\n")
+        initial_balance = 0
+        user_info = cycle_data['user_info'] if cycle_data else await tapper.get_user_info()
+        if user_info:
+            initial_balance = tapper.balance
+            logger.info(f"{tapper.session_name} | Initial balance: {initial_balance}")
+            
+            if not user_info.get('isStartBonusClaimed'):
+                if await tapper.claim_start_bonus():
+                    logger.success(f"{tapper.session_name} | Start bonus claimed")
+        
+        if await tapper.check_and_claim_streak(cycle_data.get('streak_info', _UNSET)):
+            logger.success(f"{tapper.session_name} | Streak reward claimed")
+
+        if await tapper.check_and_claim_referral_reward(
+            cycle_data.get('referral_amount', _UNSET),
+            cycle_data.get('referral_time', _UNSET)
+        ):
+            logger.success(f"{tapper.session_name} | Referral reward claimed")
+
+        await tapper.process_stories(
+            cycle_data.get('active_stories', _UNSET),
+            cycle_data.get('current_stories', _UNSET)
+        )
+        
+        await tapper.process_lessons(cycle_data.get('lessons', _UNSET))
+        
+        completed_tasks = 0
+        total_rewards = 0
+        
+        tasks = await tapper.get_tasks(
+            cycle_data.get('tasks', _UNSET),
+            cycle_data.get('current_tasks', _UNSET)
+        )
+        if tasks:
+            for task in tasks:
+                if await tapper.complete_task(task):
+                    completed_tasks += 1
+                    total_rewards += task['task']['reward']
+                    delay = random.uniform(5, 10)
+                    logger.info(f"{tapper.session_name} | Waiting {delay:.1f} sec...")
+                    await asyncio.sleep(delay)
 
-            if active_sessions:
-                await asyncio.sleep(10)
+        verified_rewards = await tapper.verification_poller.wait()
+        completed_tasks += len(verified_rewards)
+        total_rewards += sum(verified_rewards.values())
+        
+        farming_status = await tapper.get_farming_status()
+        if farming_status:
+            status = farming_status.get('status')
+            seconds_left = farming_status.get('seconds_left', 0)
+            
+            if status == 'FARMING' and seconds_left > 0:
+                next_run_in = seconds_left + 60
+            elif status == 'READY_TO_FARM':
+                if await tapper.farm():
+                    logger.success(f"{tapper.session_name} | Farming started")
+                    updated_status = await tapper.get_farming_status()
+                    if updated_status and updated_status.get('seconds_left', 0) > 0:
+                        next_run_in = updated_status['seconds_left'] + 60
             else:
-                if session_sleep_times:
-                    next_wake = min(session_sleep_times.values())
-                    sleep_seconds = max(10, (next_wake - datetime.now(timezone.utc)).total_seconds())
-                    next_session = min(session_sleep_times.items(), key=lambda x: x[1])[0]
-                    hours = int(sleep_seconds // 3600)
-                    minutes = int((sleep_seconds % 3600) // 60)
-                    logger.info(f"All sessions are sleeping. {next_session} will wake up in {hours}h {minutes}m")
-                    await asyncio.sleep(sleep_seconds)
-                else:
-                    logger.warning("No active or sleeping sessions found")
-                    await asyncio.sleep(60)
+                if await tapper.claim_farming_reward():
+                    logger.success(f"{tapper.session_name} | Farming reward claimed")
+                    if await tapper.farm():
+                        logger.success(f"{tapper.session_name} | Farming started")
+                        updated_status = await tapper.get_farming_status()
+                        if updated_status and updated_status.get('seconds_left', 0) > 0:
+                            next_run_in = updated_status['seconds_left'] + 60
+
+        if next_run_in is not None:
+            _log_next_run(tapper.session_name, next_run_in - 60)
+        else:
+            next_run_in = random.uniform(settings.SLEEP_TIME[0], settings.SLEEP_TIME[1])
 
-        except Exception as e:
-            delay = random.randint(settings.RETRY_DELAY[0], settings.RETRY_DELAY[1])
-            logger.error(f"Critical error: {e}")
-            logger.info(f"⏳ Waiting {delay} sec before retrying...")
-            await asyncio.sleep(delay)
+        final_balance = initial_balance
+        user_info = await tapper.get_user_info()
+        if user_info:
+            final_balance = tapper.balance
+        
+        logger.info(f"\n{tapper.session_name} | Summary:")
+        logger.info(f"├── Completed tasks: {completed_tasks}")
+        logger.info(f"├── Total rewards: {total_rewards}")
+        logger.info(f"├── Initial balance: {initial_balance}")
+        logger.info(f"── Final balance: {final_balance}")
+        logger.info(f"└── Gain: {final_balance - initial_balance}")
 
-async def run_tapper(tg_client: Client, proxy: str | None):
-    await run_tappers([tg_client], [proxy])
+        return next_run_in
+
+    except (RetryBudgetExhausted, CycleDeadlineExceeded) as e:
+        logger.warning(f"{tapper.session_name} | Giving up on this cycle: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"{tapper.session_name} | Unexpected error: {e}")
+        return None
+    finally:
+        reset_cycle_deadline(deadline)
+        tapper.verification_poller.cancel()
+        logger.info(f"Session processing completed: {tapper.session_name}")
+        logger.info(f"{'='*50}\n")
@@ -0,0 +1,37 @@
+class TaskIndex:
+    def __init__(self, tasks: list | None = None, current_tasks: list | None = None):
+        self.tasks: dict[str, dict] = {}
+        self.by_task: dict[str, dict] = {}
+        self.by_completion: dict[str, dict] = {}
+
+        for task in tasks or []:
+            self.tasks[task['task']['id']] = task
+        for user_task in current_tasks or []:
+            self.update(user_task)
+
+    def update(self, user_task: dict | None, task_id: str | None = None) -> dict | None:
+        if not isinstance(user_task, dict) or not user_task.get('id'):
+            return None
+
+        completion_id = user_task['id']
+        entry = {**self.by_completion.get(completion_id, {}), **user_task}
+        if task_id and not entry.get('taskId'):
+            entry['taskId'] = task_id
+
+        self.by_completion[completion_id] = entry
+        if entry.get('taskId'):
+            self.by_task[entry['taskId']] = entry
+        return entry
+
+    def task(self, task_id: str) -> dict | None:
+        return self.tasks.get(task_id)
+
+    def get(self, task_id: str) -> dict | None:
+        return self.by_task.get(task_id)
+
+    def get_completion(self, completion_id: str) -> dict | None:
+        return self.by_completion.get(completion_id)
+
+    def status(self, task_id: str) -> str | None:
+        user_task = self.by_task.get(task_id)
+        return user_task.get('status') if user_task else None
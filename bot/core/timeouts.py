@@ -0,0 +1,51 @@
+import time
+import random
+from contextvars import ContextVar, Token
+
+from aiohttp import ClientTimeout
+
+from bot.config import settings
+from bot.exceptions import CycleDeadlineExceeded
+
+AUTH_ENDPOINTS = ('auth/login', 'auth/register', 'auth/token')
+
+_cycle_deadline: ContextVar[float | None] = ContextVar('cycle_deadline', default=None)
+
+
+def endpoint_class(endpoint: str) -> str:
+    return 'auth' if endpoint in AUTH_ENDPOINTS else 'api'
+
+
+def start_cycle_deadline(seconds: float) -> Token:
+    return _cycle_deadline.set(time.monotonic() + seconds if seconds > 0 else None)
+
+
+def reset_cycle_deadline(token: Token) -> None:
+    _cycle_deadline.reset(token)
+
+
+def deadline_remaining() -> float | None:
+    deadline = _cycle_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(wait: float = 0) -> None:
+    remaining = deadline_remaining()
+    if remaining is not None and remaining <= wait:
+        raise CycleDeadlineExceeded(f"cycle deadline of {settings.SESSION_CYCLE_TIMEOUT}s reached")
+
+
+def request_timeout(kind: str = 'api') -> ClientTimeout:
+    if kind == 'auth':
+        connect, sock_read, total = settings.AUTH_TIMEOUT
+    elif kind == 'external':
+        connect, sock_read, total = settings.EXTERNAL_TIMEOUT
+    else:
+        connect, sock_read = settings.REQUEST_CONNECT_TIMEOUT, settings.REQUEST_READ_TIMEOUT
+        total = random.uniform(settings.REQUEST_TIMEOUT[0], settings.REQUEST_TIMEOUT[1])
+
+    check_deadline()
+    remaining = deadline_remaining()
+    if remaining is not None:
+        total = min(total, remaining)
+    return ClientTimeout(total=total, sock_connect=connect, sock_read=sock_read)
@@ -0,0 +1,66 @@
+import os
+import json
+import time
+import base64
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.utils.account_store import account_store
+
+
+def get_token_expiry(token: str | None) -> float | None:
+    if not token or token.count('.') != 2:
+        return None
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenStore:
+    def __init__(self, legacy_path: str = os.path.join('sessions', 'tokens.json')):
+        self._migrate(legacy_path)
+
+    @staticmethod
+    def _migrate(legacy_path: str) -> None:
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+            with account_store.batch():
+                for session_name, entry in data.items():
+                    if not account_store.get(session_name, 'tokens'):
+                        account_store.set(session_name, 'tokens', entry)
+            os.remove(legacy_path)
+        except Exception as e:
+            logger.warning(f"Failed to migrate {legacy_path}: {str(e)}")
+
+    def get(self, session_name: str) -> dict | None:
+        return account_store.get(session_name, 'tokens')
+
+    def save(self, session_name: str, access_token: str, refresh_token: str | None) -> None:
+        now = time.time()
+        account_store.set(session_name, 'tokens', {
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'access_expires_at': get_token_expiry(access_token) or now + settings.ACCESS_TOKEN_TTL,
+            'refresh_expires_at': get_token_expiry(refresh_token) or now + settings.REFRESH_TOKEN_TTL,
+        })
+
+    def clear(self, session_name: str) -> None:
+        account_store.delete(session_name, 'tokens')
+
+    @staticmethod
+    def is_access_valid(entry: dict) -> bool:
+        return entry.get('access_expires_at', 0) - settings.TOKEN_EXPIRY_MARGIN > time.time()
+
+    @staticmethod
+    def is_refresh_valid(entry: dict) -> bool:
+        return bool(entry.get('refresh_token')) and entry.get('refresh_expires_at', 0) > time.time()
+
+
+token_store = TokenStore()
@@ -1,7 +1,6 @@
 import random
-import json
-import os
 from bot.utils.logger import logger
+from bot.utils.account_store import account_store
 
 def generate_android_user_agent():
     android_versions = ['10', '11', '12', '13', '14']
@@ -42,32 +41,12 @@ def generate_android_user_agent():
     return f'Mozilla/5.0 (Linux; Android {android_version}; {device} Build/{build}) Chrome/{chrome_version} Mobile'
 
 def load_or_generate_user_agent(session_name: str) -> str:
-    ua_file = os.path.join('sessions', 'user_agents.json')
-    os.makedirs('sessions', exist_ok=True)
-    
-    try:
-        if os.path.exists(ua_file):
-            with open(ua_file, 'r') as f:
-                user_agents = json.load(f)
-                if session_name in user_agents:
-                    logger.info(f"{session_name} | Loaded saved User-Agent")
-                    return user_agents[session_name]
-        
-        user_agent = generate_android_user_agent()
-        logger.info(f"{session_name} | Generated new User-Agent")
-        
-        user_agents = {}
-        if os.path.exists(ua_file):
-            with open(ua_file, 'r') as f:
-                user_agents = json.load(f)
-        
-        user_agents[session_name] = user_agent
-        
-        with open(ua_file, 'w') as f:
-            json.dump(user_agents, f, indent=4)
-            
+    user_agent = account_store.get(session_name, 'user_agent')
+    if user_agent:
+        logger.info(f"{session_name} | Loaded saved User-Agent")
         return user_agent
-                
-    except Exception as e:
-        logger.error(f"{session_name} | Error working with User-Agent: {e}")
-        return generate_android_user_agent()
\ No newline at end of file
+
+    user_agent = generate_android_user_agent()
+    logger.info(f"{session_name} | Generated new User-Agent")
+    account_store.set(session_name, 'user_agent', user_agent)
+    return user_agent
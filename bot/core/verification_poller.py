@@ -0,0 +1,110 @@
+import random
+import asyncio
+
+from bot.config import settings
+from bot.utils.logger import logger
+
+WAITING_STATUSES = ('VERIFYING', 'FARMING', 'PENDING')
+MAX_POLL_DELAY = 60
+BACKOFF_FACTOR = 1.5
+
+
+class VerificationPoller:
+    def __init__(self, tapper):
+        self.tapper = tapper
+        self.pending: dict[str, dict] = {}
+        self.results: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def session_name(self) -> str:
+        return self.tapper.session_name
+
+    def watch(self, completion_id: str, task: dict) -> None:
+        if completion_id in self.pending:
+            self.pending[completion_id]['task'] = task
+        else:
+            self.pending[completion_id] = {'task': task, 'attempts': 0}
+            logger.info(f"{self.session_name} | {task['title']} is being verified, checking in background")
+        self._start()
+
+    def _start(self) -> None:
+        if self.pending and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def _poll(self) -> bool:
+        await self.tapper.refresh_current_tasks()
+        progressed = False
+
+        for completion_id, entry in list(self.pending.items()):
+            entry['attempts'] += 1
+            task = entry['task']
+            user_task = self.tapper.task_index.get_completion(completion_id)
+            status = user_task.get('status') if user_task else None
+
+            if status == 'COMPLETED':
+                del self.pending[completion_id]
+                progressed = True
+                reward = await self.tapper.claim_task_reward(completion_id)
+                if reward > 0:
+                    logger.success(f"{self.session_name} | {task['title']} | Received {reward} NUTS")
+                    self.results[completion_id] = reward
+            elif status == 'CLAIMED':
+                del self.pending[completion_id]
+                progressed = True
+                self.results[completion_id] = task['task']['reward']
+            elif status is not None and status not in WAITING_STATUSES:
+                del self.pending[completion_id]
+                logger.error(f"{self.session_name} | {task['title']} | Verification failed: {status}")
+            elif entry['attempts'] >= settings.VERIFY_CHECK_ATTEMPTS:
+                del self.pending[completion_id]
+                logger.error(f"{self.session_name} | {task['title']} | Verification timeout")
+
+        return progressed
+
+    async def _run(self) -> None:
+        delay = random.uniform(settings.VERIFY_CHECK_DELAY[0], settings.VERIFY_CHECK_DELAY[1])
+        while self.pending:
+            await asyncio.sleep(delay)
+            try:
+                progressed = await self._poll()
+            except Exception as e:
+                logger.error(f"{self.session_name} | Error checking task verification: {e}")
+                progressed = False
+            if progressed:
+                delay = random.uniform(settings.VERIFY_CHECK_DELAY[0], settings.VERIFY_CHECK_DELAY[1])
+            else:
+                delay = min(delay * BACKOFF_FACTOR, MAX_POLL_DELAY)
+
+    async def wait(self) -> dict[str, int]:
+        # Tasks left over from an earlier cycle are polled here too
+        self._start()
+        if self._task:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout=settings.VERIFY_WAIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.info(
+                    f"{self.session_name} | {len(self.pending)} task(s) still being verified, "
+                    f"checking again next cycle"
+                )
+                self._task.cancel()
+                await self._collect()
+            self._task = None
+        results, self.results = self.results, {}
+        return results
+
+    async def _collect(self) -> None:
+        # The poller may have finished with InvalidSession or RetryBudgetExhausted just as it was cancelled;
+        # retrieve that outcome so it is not reported as never retrieved
+        await asyncio.wait([self._task])
+        if not self._task.cancelled():
+            self._task.exception()
+
+    def cancel(self) -> None:
+        # Pending tasks and their attempt counts carry over to the next cycle
+        if self._task and self._task.done() and not self._task.cancelled():
+            self._task.exception()
+        elif self._task:
+            self._task.cancel()
+        self._task = None
+        self.results.clear()
@@ -1,2 +1,10 @@
 class InvalidSession(BaseException):
     ...
+
+
+class RetryBudgetExhausted(BaseException):
+    ...
+
+
+class CycleDeadlineExceeded(BaseException):
+    ...
@@ -1,10 +1,16 @@
+import os
+import importlib
+
 from .logger import logger
-from . import launcher
-from . import scripts
-from . import emojis
 
+_LAZY_MODULES = ("launcher", "scripts", "emojis")
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-import os
 
 if not os.path.exists("sessions"):
     os.mkdir(path="sessions")
@@ -0,0 +1,167 @@
+import os
+import json
+import atexit
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from bot.config import settings
+from bot.utils.logger import logger
+
+
+class AccountStore:
+    def __init__(self, path: str = os.path.join('sessions', 'accounts.json')):
+        self.path = path
+        self.legacy_user_agents_path = os.path.join(os.path.dirname(path), 'user_agents.json')
+        self.accounts: dict[str, dict] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._dirty_sessions: set[str] = set()
+        self._batch_depth = 0
+        self._flush_handle = None
+        self._flush_loop = None
+        self._load()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _read_json(path: str):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading {path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _parse(data) -> dict[str, dict]:
+        accounts = {}
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict) and 'session_name' in item:
+                    record = dict(item)
+                    accounts[record.pop('session_name')] = record
+        elif isinstance(data, dict):
+            for session_name, proxy in data.items():
+                accounts[session_name] = {'proxy': proxy}
+        return accounts
+
+    def _load(self) -> None:
+        data = self._read_json(self.path)
+        self.accounts = self._parse(data)
+        if isinstance(data, dict):
+            self._dirty = True
+            self._dirty_sessions.update(self.accounts)
+
+        user_agents = self._read_json(self.legacy_user_agents_path)
+        if isinstance(user_agents, dict):
+            for session_name, user_agent in user_agents.items():
+                record = self.accounts.setdefault(session_name, {})
+                if not record.get('user_agent'):
+                    record['user_agent'] = user_agent
+                    self._dirty = True
+                    self._dirty_sessions.add(session_name)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, session_name: str, key: str, default: Any = None) -> Any:
+        return self.accounts.get(session_name, {}).get(key, default)
+
+    def set(self, session_name: str, key: str, value: Any) -> None:
+        with self._lock:
+            record = self.accounts.setdefault(session_name, {})
+            if key in record and record[key] == value:
+                return
+            record[key] = value
+            self._dirty_sessions.add(session_name)
+            self._mark_dirty()
+
+    def delete(self, session_name: str, key: str) -> None:
+        with self._lock:
+            record = self.accounts.get(session_name)
+            if record is None or key not in record:
+                return
+            del record[key]
+            self._dirty_sessions.add(session_name)
+            self._mark_dirty()
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                pending = self._batch_depth == 0 and self._dirty
+            if pending:
+                self.flush()
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._batch_depth:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+
+        if self._flush_handle is not None and self._flush_loop is not loop:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self._flush_handle is None:
+            self._flush_loop = loop
+            self._flush_handle = loop.call_later(settings.ACCOUNT_STORE_FLUSH_DELAY, self.flush)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            if not self._dirty:
+                return
+
+            try:
+                with self._file_lock():
+                    for session_name, record in self._parse(self._read_json(self.path)).items():
+                        if session_name not in self._dirty_sessions:
+                            self.accounts[session_name] = record
+
+                    data_to_save = [
+                        {'session_name': session_name, **record}
+                        for session_name, record in self.accounts.items()
+                    ]
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'w') as f:
+                        json.dump(data_to_save, f, indent=4)
+                    os.replace(tmp_path, self.path)
+                self._dirty = False
+                self._dirty_sessions.clear()
+            except Exception as e:
+                logger.error(f"Error saving {self.path}: {str(e)}")
+
+
+account_store = AccountStore()
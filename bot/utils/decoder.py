@@ -0,0 +1,64 @@
+import re
+import json
+from datetime import datetime
+from typing import Any
+
+try:
+    import orjson
+
+    JSON_BACKEND = 'orjson'
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        JSON_BACKEND = 'ujson'
+        _loads = ujson.loads
+    except ImportError:
+        JSON_BACKEND = 'json'
+        _loads = json.loads
+
+_TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}')
+_NUMBER = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+
+
+def parse_timestamp(value: str) -> datetime | None:
+    if not _TIMESTAMP.match(value):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _decode_text(text: str) -> Any:
+    if _NUMBER.match(text):
+        return float(text)
+    return parse_timestamp(text) or text
+
+
+def decode_body(body: bytes, content_type: str = '') -> Any:
+    """Decode a response body read once as bytes.
+
+    Returns a JSON value, a number, a datetime for ISO timestamps (bare or
+    JSON-quoted) or the raw text when nothing else matches.
+    """
+    if not body.strip():
+        return None if 'json' in content_type else ''
+
+    first = body.lstrip()[:1]
+    if first in b'{["-0123456789tfn':
+        try:
+            value = _loads(body)
+        except ValueError:
+            pass
+        else:
+            if isinstance(value, str):
+                return parse_timestamp(value) or value
+            return value
+
+    return _decode_text(body.decode('utf-8', errors='replace').strip())
+
+
+async def read_response(response) -> Any:
+    return decode_body(await response.read(), response.headers.get('Content-Type', ''))
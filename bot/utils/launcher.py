@@ -1,28 +1,35 @@
+from __future__ import annotations
+
 import os
 import glob
 import asyncio
 import argparse
-from itertools import cycle
 import subprocess
 import signal
 import random
-
-from pyrogram import Client, compose
-from better_proxy import Proxy
+from typing import TYPE_CHECKING
 
 from bot.config import settings
 from bot.utils import logger
-from bot.utils.web import run_web_and_tunnel, stop_web_and_tunnel
-from bot.core.tapper import run_tappers
-from bot.core.registrator import register_sessions  
 from bot.utils.proxy_manager import ProxyManager
-from bot.utils.updater import UpdateManager
+from bot.utils.account_store import account_store
+from bot.utils.metrics import start_metrics_server
+from bot.utils.loop_monitor import loop_monitor
+from bot.utils.startup import startup
+
+if TYPE_CHECKING:
+    from pyrogram import Client
 
-from colorama import Fore, Style, init
+# pyrogram, Flask, colorama, the scheduler and the updater are imported by the
+# actions that need them, so `-a 1` and restarts after an update skip the rest.
 
-init(autoreset=True)
 
-start_text = f"""
+def get_start_text() -> str:
+    from colorama import Fore, Style, init
+
+    init(autoreset=True)
+
+    return f"""
 {Fore.RED}ВНИМАНИЕ: Эта ферма не предназначена для продажи!{Style.RESET_ALL}
 {Fore.RED}WARNING: This farm is not for sale!{Style.RESET_ALL}
 {Fore.RED}¡ADVERTENCIA: ¡Esta granja no está a la venta!{Style.RESET_ALL}
@@ -96,30 +103,45 @@ async def get_tg_clients() -> list[Client]:
     if not settings.API_ID or not settings.API_HASH:
         raise ValueError("API_ID and API_HASH not found in the .env file.")
 
-    tg_clients = [
-        Client(
-            name=session_name,
-            api_id=settings.API_ID,
-            api_hash=settings.API_HASH,
-            workdir="sessions/",
-            plugins=dict(root="bot/plugins"),
-        )
-        for session_name in session_names
-    ]
+    tg_clients = [create_client(session_name) for session_name in session_names]
 
     return tg_clients
 
+def assign_proxy(session_name: str, proxies: list[str]) -> str | None:
+    bound_proxy = proxy_manager.get_proxy(session_name)
+    if bound_proxy:
+        return bound_proxy
+    if proxies:
+        proxy = proxies.pop(0)
+        proxy_manager.set_proxy(session_name, proxy)
+        proxies.append(proxy)
+        return proxy
+    return None
+
+def create_client(session_name: str) -> Client:
+    from pyrogram import Client
+
+    return Client(
+        name=session_name,
+        api_id=settings.API_ID,
+        api_hash=settings.API_HASH,
+        workdir="sessions/",
+        plugins=dict(root="bot/plugins"),
+    )
+
 async def process() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-a", "--action", type=int, help="Action to perform")
     parser.add_argument("--update-restart", action="store_true", help="Indicates if the process was restarted after update")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes for action 1")
 
     logger.info(f"Detected {len(get_session_names())} sessions | {len(get_proxies())} proxies")
 
-    action = parser.parse_args().action
+    args = parser.parse_args()
+    action = args.action
 
     if not action:
-        print(start_text)
+        print(get_start_text())
 
         while True:
             action = input("> ")
@@ -134,6 +156,7 @@ async def process() -> None:
 
     if action == 1:
         tg_clients = await get_tg_clients()
+        startup.mark("sessions loaded")
         if not tg_clients:
             print("No sessions found. You can create sessions using the following methods:")
             print("1. By phone number: python main.py -a 2")
@@ -148,21 +171,17 @@ async def process() -> None:
         proxies = get_proxies()
         proxies_list = []
         
-        for client in tg_clients:
-            bound_proxy = proxy_manager.get_proxy(client.name)
-            if bound_proxy:
-                proxies_list.append(bound_proxy)
-            else:
-                if proxies:
-                    proxy = proxies.pop(0)
-                    proxy_manager.set_proxy(client.name, proxy)
-                    proxies_list.append(proxy)
-                    proxies.append(proxy)
-                else:
-                    proxies_list.append(None)
-                    
-        await run_tasks(tg_clients=tg_clients, proxies=proxies_list)
+        with account_store.batch():
+            for client in tg_clients:
+                proxies_list.append(assign_proxy(client.name, proxies))
+
+        if args.workers > 1:
+            await run_workers(tg_clients=tg_clients, proxies=proxies_list, workers=args.workers, proxy_pool=proxies)
+        else:
+            await run_tasks(tg_clients=tg_clients, proxies=proxies_list, proxy_pool=proxies)
     elif action == 2:
+        from bot.core.registrator import register_sessions
+
         await register_sessions()
     elif action == 3:
         session_name = input("Enter the session name for QR code authentication: ")
@@ -170,6 +189,8 @@ async def process() -> None:
         subprocess.run(["python", "-m", "bot.utils.loginQR", "-s", session_name])
         print("QR code authentication was successful!")
     elif action == 4:
+        from bot.utils.web import run_web_and_tunnel, stop_web_and_tunnel
+
         logger.info("Starting web interface for uploading sessions...")
         
         signal.signal(signal.SIGINT, signal_handler)
@@ -182,32 +203,57 @@ async def process() -> None:
             await stop_web_and_tunnel()
             print("Program terminated.")
 
-async def run_tasks(tg_clients: list[Client], proxies: list[str | None]):
+def watch_sessions(on_added, on_removed) -> asyncio.Task | None:
+    if not settings.SESSION_WATCH_ENABLED:
+        return None
+
+    from bot.utils.session_watcher import SessionWatcher
+
+    return asyncio.create_task(SessionWatcher(on_added, on_removed).run())
+
+async def run_tasks(tg_clients: list[Client], proxies: list[str | None], proxy_pool: list[str] | None = None):
+    from bot.core.scheduler import SessionScheduler
+    from bot.utils.updater import UpdateManager
+
+    proxy_pool = get_proxies() if proxy_pool is None else proxy_pool
+
+    if settings.METRICS_ENABLED:
+        await start_metrics_server()
+
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
     if settings.AUTO_UPDATE:
         update_manager = UpdateManager()
         update_task = asyncio.create_task(update_manager.run())
     else:
         update_task = None
         
+    watch_task = None
     try:
-        tasks = []
+        scheduler = SessionScheduler()
         for client, proxy in zip(tg_clients, proxies):
             delay = random.uniform(settings.START_DELAY[0], settings.START_DELAY[1])
             logger.info(f"{client.name} | Will start in {delay:.1f} seconds")
-            
-            async def delayed_start(client, proxy, delay):
-                await asyncio.sleep(delay)
-                await run_tappers([client], [proxy])
-                
-            tasks.append(delayed_start(client, proxy, delay))
-        
+            scheduler.add_session(client, proxy, delay)
+        startup.mark("scheduler started")
+
+        async def on_session_added(session_name: str) -> None:
+            if session_name in scheduler.sessions and session_name not in scheduler.retiring:
+                return
+            delay = random.uniform(settings.START_DELAY[0], settings.START_DELAY[1])
+            logger.info(f"{session_name} | New session found, will start in {delay:.1f} seconds")
+            scheduler.add_session(create_client(session_name), assign_proxy(session_name, proxy_pool), delay)
+
+        watch_task = watch_sessions(on_session_added, scheduler.retire_session)
+
         if update_task:
             await asyncio.gather(
                 update_task,
-                *tasks
+                scheduler.run()
             )
         else:
-            await asyncio.gather(*tasks)
+            await scheduler.run()
             
     except asyncio.CancelledError:
         if update_task:
@@ -218,6 +264,45 @@ async def run_tasks(tg_clients: list[Client], proxies: list[str | None]):
         if update_task:
             update_task.cancel()
         raise
+    finally:
+        if watch_task:
+            watch_task.cancel()
+
+async def run_workers(
+    tg_clients: list[Client], proxies: list[str | None], workers: int, proxy_pool: list[str] | None = None
+):
+    from bot.utils.supervisor import WorkerSupervisor
+    from bot.utils.updater import UpdateManager
+
+    proxy_pool = get_proxies() if proxy_pool is None else proxy_pool
+
+    supervisor = WorkerSupervisor([(client.name, proxy) for client, proxy in zip(tg_clients, proxies)], workers)
+
+    if settings.METRICS_ENABLED:
+        await start_metrics_server(render=supervisor.render_metrics)
+
+    if settings.AUTO_UPDATE:
+        update_manager = UpdateManager(workers=workers, before_restart=supervisor.stop)
+        update_task = asyncio.create_task(update_manager.run())
+    else:
+        update_task = None
+
+    async def on_session_added(session_name: str) -> None:
+        if not supervisor.has_session(session_name):
+            supervisor.add_session(session_name, assign_proxy(session_name, proxy_pool))
+
+    async def on_session_removed(session_name: str) -> None:
+        supervisor.remove_session(session_name)
+
+    watch_task = watch_sessions(on_session_added, on_session_removed)
+
+    try:
+        await supervisor.run()
+    finally:
+        if update_task:
+            update_task.cancel()
+        if watch_task:
+            watch_task.cancel()
 
 def signal_handler(signum, frame):
     print("\nShutting down...")
@@ -1,8 +1,15 @@
+import io
+import json
+import time
+import queue
+import atexit
 import logging
+import threading
 from datetime import datetime
 from rich.console import Console
 from rich.theme import Theme
-from rich.emoji import Emoji
+from rich.text import Text
+from rich.errors import MarkupError
 from bot.config import settings
 
 custom_theme = Theme({
@@ -11,11 +18,25 @@ custom_theme = Theme({
     "error": "red",
     "success": "bold green",
     "timestamp": "cyan",
-    "debug": "dim white" 
+    "debug": "dim white"
 })
 
 console = Console(theme=custom_theme)
 
+
+def _plain(message: str) -> str:
+    try:
+        return Text.from_markup(message).plain
+    except MarkupError:
+        return message
+
+
+def _render_to_text(renderable) -> str:
+    buffer = io.StringIO()
+    Console(file=buffer, width=console.width, no_color=True, emoji=False).print(renderable)
+    return buffer.getvalue().rstrip('\n')
+
+
 class PawsLogger:
     EMOJIS = {
         "info": "ℹ️ ",
@@ -25,58 +46,130 @@ class PawsLogger:
         "debug": "🔍 "
     }
 
-    @staticmethod
-    def _get_timestamp():
-        return datetime.now().strftime("%H:%M:%S")
+    def __init__(self, maxsize: int | None = None):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize or settings.LOG_QUEUE_SIZE)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        atexit.register(self.flush)
 
     @staticmethod
-    def _format_message(emoji: str, message: str, level: str):
-        timestamp = f"[timestamp]{PawsLogger._get_timestamp()}[/timestamp]"
+    def _format_message(emoji: str, message: str, level: str, created: datetime):
+        timestamp = f"[timestamp]{created.strftime('%H:%M:%S')}[/timestamp]"
         return f"{emoji}{timestamp} | [{level}]{message}[/{level}]"
 
+    @staticmethod
+    def _is_debug() -> bool:
+        return settings.LOGGING_LEVEL.upper() == "DEBUG"
+
     @classmethod
     def _should_log_detail(cls, detail_type: str) -> bool:
-        if not settings.DETAILED_LOGGING:
+        if not cls._is_debug():
             return False
-        
+
         detail_map = {
-            'auth': settings.LOG_AUTH_DATA,
-            'response': settings.LOG_RESPONSE_DATA,
-            'request': settings.LOG_REQUEST_DATA,
             'user_agent': settings.LOG_USER_AGENT,
             'proxy': settings.LOG_PROXY
         }
         return detail_map.get(detail_type, False)
 
-    @classmethod
-    def info(cls, message: str, detail_type: str = None):
-        if detail_type and not cls._should_log_detail(detail_type):
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
             return
-        formatted = cls._format_message(cls.EMOJIS["info"], message, "info")
-        console.print(formatted)
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
 
-    @classmethod
-    def debug(cls, message: str, detail_type: str = None):
-        if detail_type and not cls._should_log_detail(detail_type):
+    def _enqueue(self, record) -> None:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def _take_dropped(self) -> int:
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    def _write(self, level: str, message: str, created: datetime) -> None:
+        log_format = settings.LOG_FORMAT.lower()
+        if log_format == "json":
+            console.file.write(json.dumps({
+                "time": created.isoformat(timespec="milliseconds"),
+                "level": level,
+                "message": _plain(message)
+            }, ensure_ascii=False) + "\n")
+        elif log_format == "plain":
+            console.file.write(f"{created.strftime('%Y-%m-%d %H:%M:%S')} | {level.upper():<7} | {_plain(message)}\n")
+        else:
+            console.print(self._format_message(self.EMOJIS[level], message, level, created))
+
+    def _write_renderable(self, renderable, created: datetime) -> None:
+        if settings.LOG_FORMAT.lower() == "rich":
+            console.print(renderable)
+        else:
+            self._write("info", _render_to_text(renderable), created)
+
+    def _handle(self, record) -> None:
+        kind, payload, created = record
+        if kind == "renderable":
+            self._write_renderable(payload, created)
+        else:
+            self._write(kind, payload, created)
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                self._handle(record)
+                dropped = self._take_dropped()
+                if dropped and self._queue.empty():
+                    self._write("warning", f"Log queue was full, {dropped} messages dropped", datetime.now())
+                elif dropped:
+                    with self._dropped_lock:
+                        self._dropped += dropped
+                console.file.flush()
+            except Exception:
+                pass
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: float = 5) -> None:
+        if self._thread is None or not self._thread.is_alive():
             return
-        if settings.DETAILED_LOGGING:
-            formatted = cls._format_message(cls.EMOJIS["debug"], message, "debug")
-            console.print(formatted)
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
 
-    @classmethod
-    def warning(cls, message: str):
-        formatted = cls._format_message(cls.EMOJIS["warning"], message, "warning")
-        console.print(formatted)
+    def _log(self, level: str, message: str) -> None:
+        self._enqueue((level, message, datetime.now()))
 
-    @classmethod
-    def error(cls, message: str):
-        formatted = cls._format_message(cls.EMOJIS["error"], message, "error")
-        console.print(formatted)
+    def print(self, renderable) -> None:
+        self._enqueue(("renderable", renderable, datetime.now()))
 
-    @classmethod
-    def success(cls, message: str):
-        formatted = cls._format_message(cls.EMOJIS["success"], message, "success")
-        console.print(formatted)
+    def info(self, message: str, detail_type: str = None):
+        if detail_type and not self._should_log_detail(detail_type):
+            return
+        self._log("info", message)
+
+    def debug(self, message: str, detail_type: str = None):
+        if detail_type and not self._should_log_detail(detail_type):
+            return
+        if self._is_debug():
+            self._log("debug", message)
+
+    def warning(self, message: str):
+        self._log("warning", message)
+
+    def error(self, message: str):
+        self._log("error", message)
+
+    def success(self, message: str):
+        self._log("success", message)
 
 # Отключаем логи Pyrogram
 logging.getLogger("pyrogram").setLevel(logging.WARNING)
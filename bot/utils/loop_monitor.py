@@ -0,0 +1,126 @@
+import re
+import time
+import asyncio
+import logging
+from collections import deque
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.utils.metrics import LOOP_LAG, LOOP_LAG_P99, SLOW_CALLBACKS
+
+_ADDRESS = re.compile(r' at 0x[0-9a-f]+|0x[0-9a-f]+')
+_CORO = re.compile(r'coro=<(\S+) (?:running|done), defined at ([^>]+)>|coro=<(\S+) running at ([^>]+)>')
+
+
+def install_event_loop_policy() -> str:
+    if settings.EVENT_LOOP.lower() == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("EVENT_LOOP=uvloop but uvloop is not installed, using the default asyncio loop")
+            return "asyncio"
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return "uvloop"
+    return "asyncio"
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class SlowCallbackCollector(logging.Handler):
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.callbacks: dict[str, list[float]] = {}
+
+    @staticmethod
+    def _describe(callback: str) -> str:
+        match = _CORO.search(callback)
+        if match:
+            coro, location = match.group(1) or match.group(3), match.group(2) or match.group(4)
+            return f"{coro} at {location}"
+        return _ADDRESS.sub('', callback.split(' created at ')[0]).strip('<>')
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not isinstance(record.msg, str) or not record.msg.startswith('Executing ') or not isinstance(record.args, tuple) or len(record.args) != 2:
+            return
+        callback, duration = record.args
+        name = self._describe(str(callback))
+        stats = self.callbacks.setdefault(name, [0, 0.0])
+        stats[0] += 1
+        stats[1] = max(stats[1], float(duration))
+        SLOW_CALLBACKS.inc()
+
+    def take(self, limit: int = 5) -> list[tuple[str, int, float]]:
+        callbacks, self.callbacks = self.callbacks, {}
+        ranked = sorted(callbacks.items(), key=lambda item: item[1][1], reverse=True)
+        return [(name, count, worst) for name, (count, worst) in ranked[:limit]]
+
+
+class LoopMonitor:
+    def __init__(self):
+        self.samples: deque[float] = deque(maxlen=10000)
+        self.collector = None
+        self._propagate = True
+        self._task = None
+
+    def _enable_slow_callback_capture(self, loop: asyncio.AbstractEventLoop) -> None:
+        loop.set_debug(True)
+        loop.slow_callback_duration = settings.LOOP_SLOW_CALLBACK
+        self.collector = SlowCallbackCollector()
+        asyncio_logger = logging.getLogger('asyncio')
+        asyncio_logger.addHandler(self.collector)
+        self._propagate = asyncio_logger.propagate
+        asyncio_logger.propagate = False
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        loop = asyncio.get_running_loop()
+        if settings.LOOP_MONITOR_DEBUG:
+            self._enable_slow_callback_capture(loop)
+        self._task = loop.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.collector is not None:
+            asyncio_logger = logging.getLogger('asyncio')
+            asyncio_logger.removeHandler(self.collector)
+            asyncio_logger.propagate = self._propagate
+            self.collector = None
+
+    def _report(self) -> None:
+        samples = list(self.samples)
+        self.samples.clear()
+        if not samples:
+            return
+        p99 = _percentile(samples, 99)
+        LOOP_LAG_P99.set(p99)
+        logger.info(
+            f"Event loop lag | p50: {_percentile(samples, 50) * 1000:.1f}ms | "
+            f"p99: {p99 * 1000:.1f}ms | max: {max(samples) * 1000:.1f}ms"
+        )
+        if self.collector is not None:
+            for name, count, worst in self.collector.take():
+                logger.warning(f"Slow callback | {count}x, worst {worst * 1000:.0f}ms | {name}")
+
+    async def _run(self) -> None:
+        interval = settings.LOOP_MONITOR_INTERVAL
+        last_report = time.monotonic()
+        while True:
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            lag = max(0.0, time.monotonic() - expected)
+            self.samples.append(lag)
+            LOOP_LAG.observe(lag)
+            if time.monotonic() - last_report >= settings.LOOP_MONITOR_REPORT_INTERVAL:
+                self._report()
+                last_report = time.monotonic()
+
+
+loop_monitor = LoopMonitor()
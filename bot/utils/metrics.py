@@ -0,0 +1,255 @@
+import re
+import bisect
+import threading
+
+from bot.config import settings
+from bot.utils.logger import logger
+
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{16,})$')
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    return '/'.join(':id' if _ID_SEGMENT.match(part) else part for part in endpoint.split('/'))
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = '', const_labels: dict | None = None) -> str:
+    pairs = [f'{name}="{value}"' for name, value in (const_labels or {}).items()]
+    pairs.extend(f'{name}="{value}"' for name, value in zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def samples(self) -> list[tuple]:
+        raise NotImplementedError
+
+    def render(self, const_labels: dict | None = None) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for suffix, values, value, extra in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, values, extra, const_labels)} {value}")
+        return lines
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        return [('_total', key, value, '') for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        return [('', key, value, '') for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state['buckets'][index] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    def samples(self):
+        result = []
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['buckets']):
+                cumulative += count
+                result.append(('_bucket', key, cumulative, f'le="{bound}"'))
+            result.append(('_bucket', key, state['count'], 'le="+Inf"'))
+            result.append(('_sum', key, state['sum'], ''))
+            result.append(('_count', key, state['count'], ''))
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self, const_labels: dict | None = None) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render(const_labels))
+        return '\n'.join(lines) + '\n'
+
+
+def merge_expositions(texts: list[str]) -> str:
+    headers: dict[str, list[str]] = {}
+    samples: dict[str, list[str]] = {}
+    for text in texts:
+        name = None
+        for line in text.splitlines():
+            if line.startswith('# HELP ') or line.startswith('# TYPE '):
+                name = line.split(' ', 3)[2]
+                family = headers.setdefault(name, [])
+                if line not in family:
+                    family.append(line)
+                samples.setdefault(name, [])
+            elif line and name:
+                samples[name].append(line)
+
+    lines = []
+    for name, family in headers.items():
+        lines.extend(family)
+        lines.extend(samples[name])
+    return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+REQUEST_DURATION = metrics.histogram(
+    'nutsfarm_request_duration_seconds', 'API request latency per endpoint', ('endpoint',)
+)
+RESPONSES = metrics.counter(
+    'nutsfarm_responses', 'API responses per endpoint and HTTP status', ('endpoint', 'status')
+)
+REQUEST_ERRORS = metrics.counter(
+    'nutsfarm_request_errors', 'API requests that failed without an HTTP response', ('endpoint', 'error')
+)
+REQUEST_RETRIES = metrics.counter(
+    'nutsfarm_request_retries', 'API request retries per endpoint', ('endpoint', 'reason')
+)
+PROXY_CHECK_DURATION = metrics.histogram(
+    'nutsfarm_proxy_check_duration_seconds', 'Proxy health check latency', ('result',)
+)
+SESSION_CYCLE_DURATION = metrics.histogram(
+    'nutsfarm_session_cycle_duration_seconds', 'Duration of one session cycle',
+    buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+)
+ACTIVE_SESSIONS = metrics.gauge(
+    'nutsfarm_active_sessions', 'Sessions currently running a cycle'
+)
+SCHEDULED_SESSIONS = metrics.gauge(
+    'nutsfarm_scheduled_sessions', 'Sessions known to the scheduler'
+)
+TG_OPEN_CONNECTIONS = metrics.gauge(
+    'nutsfarm_telegram_open_connections', 'Telegram clients kept connected by the connection manager'
+)
+TG_CONNECTS = metrics.counter(
+    'nutsfarm_telegram_connects', 'Telegram connections opened, first-time or reconnect', ('kind',)
+)
+WORKERS_ALIVE = metrics.gauge(
+    'nutsfarm_workers_alive', 'Worker processes currently running'
+)
+WORKER_RESTARTS = metrics.counter(
+    'nutsfarm_worker_restarts', 'Worker processes restarted after exiting unexpectedly', ('worker',)
+)
+RATE_LIMIT_RATE = metrics.gauge(
+    'nutsfarm_rate_limit_rps', 'Current request rate allowed by each rate limiter bucket', ('bucket',)
+)
+RETRY_BUDGET_EXHAUSTED = metrics.counter(
+    'nutsfarm_retry_budget_exhausted', 'Session cycles abandoned because their retry budget was spent'
+)
+CIRCUIT_STATE = metrics.gauge(
+    'nutsfarm_circuit_breaker_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open)', ('breaker',)
+)
+CIRCUIT_TRANSITIONS = metrics.counter(
+    'nutsfarm_circuit_breaker_transitions', 'Circuit breaker state changes', ('breaker', 'state')
+)
+CIRCUIT_REJECTED = metrics.counter(
+    'nutsfarm_circuit_breaker_rejected', 'Requests failed fast by an open circuit breaker', ('breaker',)
+)
+PROXY_CHECK_ATTEMPTS = metrics.counter(
+    'nutsfarm_proxy_check_attempts', 'Proxy check requests by endpoint and result (success, failure, cancelled)',
+    ('endpoint', 'result')
+)
+PROXY_CHECK_ENDPOINT_LATENCY = metrics.gauge(
+    'nutsfarm_proxy_check_endpoint_latency_seconds', 'Moving average latency of each proxy check endpoint', ('endpoint',)
+)
+UPDATE_CHECK_DURATION = metrics.histogram(
+    'nutsfarm_update_check_duration_seconds', 'Duration of git update checks by result', ('result',),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+LOOP_LAG = metrics.histogram(
+    'nutsfarm_event_loop_lag_seconds', 'Delay between a scheduled wakeup and the moment the event loop ran it',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+LOOP_LAG_P99 = metrics.gauge(
+    'nutsfarm_event_loop_lag_p99_seconds', 'p99 event loop lag over the last report interval'
+)
+SLOW_CALLBACKS = metrics.counter(
+    'nutsfarm_slow_callbacks', 'Callbacks that blocked the event loop longer than LOOP_SLOW_CALLBACK'
+)
+
+
+async def start_metrics_server(host: str | None = None, port: int | None = None, render=None):
+    from aiohttp import web
+
+    render = render or metrics.render
+
+    async def handle_metrics(_: web.Request) -> web.Response:
+        return web.Response(text=render(), content_type='text/plain', charset='utf-8')
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host or settings.METRICS_HOST, port or settings.METRICS_PORT)
+    await site.start()
+    logger.info(f"Metrics available at http://{host or settings.METRICS_HOST}:{port or settings.METRICS_PORT}/metrics")
+    return runner
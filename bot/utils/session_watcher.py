@@ -0,0 +1,103 @@
+import os
+import time
+import asyncio
+from typing import Awaitable, Callable
+
+from bot.config import settings
+from bot.utils.logger import logger
+
+SESSION_SUFFIX = '.session'
+
+
+class SessionWatcher:
+    def __init__(
+        self,
+        on_added: Callable[[str], Awaitable[None]],
+        on_removed: Callable[[str], Awaitable[None]],
+        directory: str = "sessions"
+    ):
+        self.on_added = on_added
+        self.on_removed = on_removed
+        self.directory = directory
+        self.known: dict[str, float] = {}
+        self._changed: asyncio.Event | None = None
+
+    def _scan(self) -> dict[str, float]:
+        sessions = {}
+        try:
+            entries = os.scandir(self.directory)
+        except FileNotFoundError:
+            return sessions
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(SESSION_SUFFIX):
+                    continue
+                try:
+                    if entry.is_file():
+                        sessions[entry.name[:-len(SESSION_SUFFIX)]] = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+        return sessions
+
+    async def sync(self) -> float | None:
+        current = self._scan()
+        now = time.time()
+        settle_in = None
+
+        for session_name in self.known.keys() - current.keys():
+            del self.known[session_name]
+            logger.info(f"{session_name} | Session file removed")
+            await self.on_removed(session_name)
+
+        for session_name, mtime in current.items():
+            if self.known.get(session_name) == mtime:
+                continue
+            age = now - mtime
+            if age < settings.SESSION_WATCH_SETTLE:
+                remaining = settings.SESSION_WATCH_SETTLE - age
+                settle_in = remaining if settle_in is None else min(settle_in, remaining)
+                continue
+            self.known[session_name] = mtime
+            await self.on_added(session_name)
+
+        return settle_in
+
+    async def _watch_events(self, awatch) -> None:
+        def is_session(_, path: str) -> bool:
+            return path.endswith(SESSION_SUFFIX)
+
+        async for _ in awatch(self.directory, watch_filter=is_session):
+            self._changed.set()
+
+    async def run(self) -> None:
+        self._changed = asyncio.Event()
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            awatch = None
+
+        events = asyncio.create_task(self._watch_events(awatch)) if awatch else None
+        logger.info(f"Watching {self.directory}/ for new sessions ({'inotify' if events else 'polling'})")
+
+        try:
+            while True:
+                self._changed.clear()
+                try:
+                    settle_in = await self.sync()
+                except Exception as e:
+                    logger.error(f"Error checking session files: {e}")
+                    settle_in = None
+
+                timeout = settings.SESSION_WATCH_INTERVAL
+                if events and not events.done():
+                    timeout = settle_in
+                elif settle_in is not None:
+                    timeout = min(timeout, settle_in)
+
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if events:
+                events.cancel()
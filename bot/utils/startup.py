@@ -0,0 +1,28 @@
+import time
+
+from bot.utils.logger import logger
+
+
+class StartupTimeline:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: list[tuple[str, float]] = []
+        self.reported = False
+
+    def begin(self, started_at: float) -> None:
+        self.started_at = started_at
+
+    def mark(self, stage: str) -> None:
+        if self.reported or any(name == stage for name, _ in self.stages):
+            return
+        self.stages.append((stage, time.perf_counter() - self.started_at))
+
+    def report(self, stage: str) -> None:
+        if self.reported:
+            return
+        self.mark(stage)
+        self.reported = True
+        logger.info("Startup | " + " → ".join(f"{name} {elapsed:.2f}s" for name, elapsed in self.stages))
+
+
+startup = StartupTimeline()
@@ -0,0 +1,218 @@
+import os
+import time
+import zlib
+import queue
+import random
+import signal
+import asyncio
+import multiprocessing
+
+from bot.config import settings
+from bot.utils.logger import logger
+from bot.utils.loop_monitor import loop_monitor, install_event_loop_policy
+from bot.utils.startup import startup
+from bot.utils.metrics import metrics, merge_expositions, WORKERS_ALIVE, WORKER_RESTARTS
+
+STATUS_INTERVAL = 10
+STATUS_LOG_INTERVAL = 300
+STABLE_RUN_SECONDS = 300
+MAX_RESTART_DELAY = 60
+
+
+def shard_of(session_name: str, workers: int) -> int:
+    return zlib.crc32(session_name.encode()) % workers
+
+
+def shard_sessions(sessions: list[tuple[str, str | None]], workers: int) -> list[list[tuple[str, str | None]]]:
+    shards = [[] for _ in range(workers)]
+    for session_name, proxy in sessions:
+        shards[shard_of(session_name, workers)].append((session_name, proxy))
+    return shards
+
+
+async def _report_status(index: int, scheduler, status_queue) -> None:
+    while True:
+        status_queue.put({
+            'worker': index,
+            'pid': os.getpid(),
+            'sessions': len(scheduler.sessions),
+            'active': len(scheduler.active_sessions),
+            'metrics': metrics.render({'worker': index})
+        })
+        await asyncio.sleep(STATUS_INTERVAL)
+
+
+async def _apply_commands(scheduler, command_queue) -> None:
+    from bot.utils.launcher import create_client
+
+    while True:
+        try:
+            command, session_name, proxy = command_queue.get_nowait()
+        except queue.Empty:
+            await asyncio.sleep(1)
+            continue
+        if command == 'add':
+            delay = random.uniform(settings.START_DELAY[0], settings.START_DELAY[1])
+            logger.info(f"{session_name} | New session found, will start in {delay:.1f} seconds")
+            scheduler.add_session(create_client(session_name), proxy, delay)
+        elif command == 'remove':
+            await scheduler.retire_session(session_name)
+
+
+async def _run_worker(index: int, sessions: list[tuple[str, str | None]], status_queue, command_queue) -> None:
+    from bot.utils.launcher import create_client
+    from bot.core.scheduler import SessionScheduler
+
+    scheduler = SessionScheduler()
+    for session_name, proxy in sessions:
+        delay = random.uniform(settings.START_DELAY[0], settings.START_DELAY[1])
+        scheduler.add_session(create_client(session_name), proxy, delay)
+    startup.mark("scheduler started")
+
+    logger.info(f"Worker {index} | Started with {len(sessions)} sessions (pid {os.getpid()})")
+    reporter = asyncio.create_task(_report_status(index, scheduler, status_queue))
+    commands = asyncio.create_task(_apply_commands(scheduler, command_queue))
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    try:
+        await scheduler.run()
+    finally:
+        reporter.cancel()
+        commands.cancel()
+        loop_monitor.stop()
+
+
+def _exit_on_sigterm(signum, frame):
+    raise SystemExit(0)
+
+
+def worker_main(index: int, sessions: list[tuple[str, str | None]], status_queue, command_queue) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    install_event_loop_policy()
+    asyncio.run(_run_worker(index, sessions, status_queue, command_queue))
+
+
+class WorkerSupervisor:
+    def __init__(self, sessions: list[tuple[str, str | None]], workers: int):
+        self.shards = shard_sessions(sessions, workers)
+        self.context = multiprocessing.get_context('spawn')
+        self.status_queue = self.context.Queue()
+        self.command_queues: dict[int, multiprocessing.queues.Queue] = {}
+        self.processes: dict[int, multiprocessing.process.BaseProcess] = {}
+        self.started_at: dict[int, float] = {}
+        self.restart_at: dict[int, float] = {}
+        self.restart_counts: dict[int, int] = {}
+        self.status: dict[int, dict] = {}
+
+    def _start(self, index: int) -> None:
+        self.command_queues[index] = self.context.Queue()
+        process = self.context.Process(
+            target=worker_main,
+            args=(index, self.shards[index], self.status_queue, self.command_queues[index]),
+            name=f"nutsfarm-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        self.processes[index] = process
+        self.started_at[index] = time.monotonic()
+        self.restart_at.pop(index, None)
+
+    def has_session(self, session_name: str) -> bool:
+        shard = self.shards[shard_of(session_name, len(self.shards))]
+        return any(name == session_name for name, _ in shard)
+
+    def add_session(self, session_name: str, proxy: str | None) -> None:
+        index = shard_of(session_name, len(self.shards))
+        self.shards[index].append((session_name, proxy))
+        if index in self.processes:
+            self.command_queues[index].put(('add', session_name, proxy))
+        elif index not in self.restart_at:
+            logger.info(f"Worker {index} | Starting for new session {session_name}")
+            self._start(index)
+
+    def remove_session(self, session_name: str) -> None:
+        index = shard_of(session_name, len(self.shards))
+        self.shards[index] = [(name, proxy) for name, proxy in self.shards[index] if name != session_name]
+        if index in self.processes:
+            self.command_queues[index].put(('remove', session_name, None))
+
+    def _handle_exit(self, index: int, process) -> None:
+        del self.processes[index]
+        self.status.pop(index, None)
+
+        if process.exitcode == 0:
+            logger.info(f"Worker {index} | Finished")
+            return
+
+        if time.monotonic() - self.started_at[index] > STABLE_RUN_SECONDS:
+            self.restart_counts[index] = 0
+        restarts = self.restart_counts.get(index, 0)
+        delay = min(MAX_RESTART_DELAY, 2 ** restarts)
+        self.restart_counts[index] = restarts + 1
+        self.restart_at[index] = time.monotonic() + delay
+        WORKER_RESTARTS.inc(worker=index)
+        logger.warning(f"Worker {index} | Exited with code {process.exitcode}, restarting in {delay}s")
+
+    def _check_workers(self) -> None:
+        for index, process in list(self.processes.items()):
+            if not process.is_alive():
+                self._handle_exit(index, process)
+
+        now = time.monotonic()
+        for index, restart_at in list(self.restart_at.items()):
+            if restart_at <= now:
+                self._start(index)
+
+        WORKERS_ALIVE.set(len(self.processes))
+
+    def _drain_status(self) -> None:
+        while True:
+            try:
+                status = self.status_queue.get_nowait()
+            except queue.Empty:
+                return
+            if status['worker'] in self.processes:
+                self.status[status['worker']] = status
+
+    def _log_status(self) -> None:
+        sessions = sum(status['sessions'] for status in self.status.values())
+        active = sum(status['active'] for status in self.status.values())
+        restarts = sum(self.restart_counts.values())
+        logger.info(
+            f"Workers: {len(self.processes)}/{sum(1 for shard in self.shards if shard)} alive | "
+            f"Sessions: {sessions} | Active: {active} | Restarts: {restarts}"
+        )
+
+    def render_metrics(self) -> str:
+        return merge_expositions([metrics.render()] + [status['metrics'] for status in self.status.values()])
+
+    async def run(self) -> None:
+        for index, shard in enumerate(self.shards):
+            if shard:
+                self._start(index)
+        logger.info(f"Started {len(self.processes)} workers for {sum(map(len, self.shards))} sessions")
+
+        last_log = time.monotonic()
+        try:
+            while self.processes or self.restart_at:
+                await asyncio.sleep(1)
+                self._drain_status()
+                self._check_workers()
+                if time.monotonic() - last_log >= STATUS_LOG_INTERVAL:
+                    self._log_status()
+                    last_log = time.monotonic()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(10)
+            if process.is_alive():
+                process.kill()
+        self.processes.clear()
+        self.restart_at.clear()
+        WORKERS_ALIVE.set(0)
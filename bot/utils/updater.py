@@ -1,99 +1,147 @@
 import os
 import sys
+import time
 import asyncio
 import subprocess
 from typing import Optional
 from bot.utils import logger
 from bot.config import settings
+from bot.utils.account_store import account_store
+from bot.utils.metrics import UPDATE_CHECK_DURATION
+
+
+GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+INSTALL_TIMEOUT = 900
+MAX_CHECK_BACKOFF = 3600
+
+
+async def run_command(args: list[str], timeout: float, capture: bool = True) -> str:
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE if capture else None,
+        stderr=asyncio.subprocess.PIPE if capture else None,
+        env=GIT_ENV
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(args, timeout)
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+        raise
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+    return stdout.decode(errors="replace") if stdout else ""
+
 
 class UpdateManager:
-    def __init__(self):
+    def __init__(self, workers: int = 1, before_restart=None):
         self.branch = "main"
         self.check_interval = settings.CHECK_UPDATE_INTERVAL
         self.is_update_restart = "--update-restart" in sys.argv
-        self._configure_git_safe_directory()
-        self._check_and_switch_repository()
+        self.workers = workers
+        self.before_restart = before_restart
+        self.failures = 0
 
-    def _configure_git_safe_directory(self) -> None:
+    async def _git(self, *args: str) -> str:
+        return await run_command(["git", *args], settings.UPDATE_CHECK_TIMEOUT)
+
+    async def _configure_git_safe_directory(self) -> None:
         try:
             current_dir = os.getcwd()
-            subprocess.run(
-                ["git", "config", "--global", "--add", "safe.directory", current_dir],
-                check=True,
-                capture_output=True
-            )
+            await self._git("config", "--global", "--add", "safe.directory", current_dir)
             logger.info("Git safe.directory configured successfully")
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logger.error(f"Failed to configure git safe.directory: {e}")
 
-    def _check_requirements_changed(self) -> bool:
+    async def _check_requirements_changed(self) -> bool:
         try:
-            result = subprocess.run(
-                ["git", "diff", "--name-only", "HEAD@{1}", "HEAD"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            changed_files = result.stdout.strip().split('\n')
+            output = await self._git("diff", "--name-only", "HEAD@{1}", "HEAD")
+            changed_files = output.strip().split('\n')
             return "requirements.txt" in changed_files
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logger.error(f"Error checking requirements changes: {e}")
             return True
 
     async def check_for_updates(self) -> bool:
+        started = time.monotonic()
+        result = "error"
         try:
-            subprocess.run(["git", "fetch"], check=True, capture_output=True)
-            result = subprocess.run(
-                ["git", "status", "-uno"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return "Your branch is behind" in result.stdout
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error checking updates: {e}")
-            return False
+            await self._git("fetch")
+            output = await self._git("status", "-uno")
+            result = "ok"
+            return "Your branch is behind" in output
+        except subprocess.TimeoutExpired:
+            result = "timeout"
+            raise
+        finally:
+            UPDATE_CHECK_DURATION.observe(time.monotonic() - started, result=result)
 
-    def _pull_updates(self) -> bool:
+    async def _pull_updates(self) -> bool:
         try:
-            subprocess.run(["git", "pull"], check=True, capture_output=True)
+            await self._git("pull")
             return True
+        except subprocess.TimeoutExpired as e:
+            logger.error(f"Error updating: {e}")
+            return False
         except subprocess.CalledProcessError as e:
             logger.error(f"Error updating: {e}")
             if e.stderr:
                 logger.error(f"Git error details: {e.stderr.decode()}")
             return False
 
-    def _install_requirements(self) -> bool:
+    async def _install_requirements(self) -> bool:
         try:
-            if not self._check_requirements_changed():
+            if not await self._check_requirements_changed():
                 logger.info("📦 No changes in requirements.txt, skipping dependency installation")
                 return True
                 
             logger.info("📦 Changes detected in requirements.txt, updating dependencies...")
-            subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], check=True)
+            await run_command(
+                [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+                INSTALL_TIMEOUT,
+                capture=False
+            )
             return True
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logger.error(f"Error installing dependencies: {e}")
             return False
 
     async def update_and_restart(self) -> None:
         logger.info("🔄 Update detected! Starting update process...")
         
-        if not self._pull_updates():
+        if not await self._pull_updates():
             logger.error("❌ Failed to pull updates")
             return
 
-        if not self._install_requirements():
+        if not await self._install_requirements():
             logger.error("❌ Failed to update dependencies")
             return
 
         logger.info("✅ Update successfully installed! Restarting application...")
         
+        if self.before_restart:
+            self.before_restart()
+        account_store.flush()
+        logger.flush()
         new_args = [sys.executable, sys.argv[0], "-a", "1", "--update-restart"]
+        if self.workers > 1:
+            new_args += ["--workers", str(self.workers)]
         os.execv(sys.executable, new_args)
 
+    def _next_check_delay(self) -> float:
+        if not self.failures:
+            return self.check_interval
+        return min(self.check_interval * 2 ** self.failures, max(self.check_interval, MAX_CHECK_BACKOFF))
+
     async def run(self) -> None:
+        await self._configure_git_safe_directory()
+        await self._check_and_switch_repository()
+
         if not self.is_update_restart:
             await asyncio.sleep(10)
         
@@ -101,41 +149,40 @@ class UpdateManager:
             try:
                 if await self.check_for_updates():
                     await self.update_and_restart()
-                await asyncio.sleep(self.check_interval)
+                self.failures = 0
+            except subprocess.TimeoutExpired:
+                self.failures += 1
+                logger.warning(f"Update check timed out after {settings.UPDATE_CHECK_TIMEOUT}s")
             except Exception as e:
+                self.failures += 1
                 logger.error(f"Error during update check: {e}")
-                await asyncio.sleep(60)
 
-    def _get_current_remote(self) -> str:
+            delay = self._next_check_delay()
+            if self.failures:
+                logger.info(f"Next update check in {delay:.0f} seconds")
+            await asyncio.sleep(delay)
+
+    async def _get_current_remote(self) -> str:
         try:
-            result = subprocess.run(
-                ["git", "remote", "get-url", "origin"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
+            output = await self._git("remote", "get-url", "origin")
+            return output.strip()
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logger.error(f"Error getting current repository: {e}")
             return ""
 
-    def _switch_to_bitbucket(self, current_remote: str) -> None:
+    async def _switch_to_bitbucket(self, current_remote: str) -> None:
         try:
             if "github.com" in current_remote:
                 new_remote = current_remote.replace("github.com", "bitbucket.org")
-                subprocess.run(
-                    ["git", "remote", "set-url", "origin", new_remote],
-                    check=True,
-                    capture_output=True
-                )
+                await self._git("remote", "set-url", "origin", new_remote)
                 logger.info("🔄 Successfully switched to Bitbucket")
                 
-                subprocess.run(["git", "fetch"], check=True, capture_output=True)
+                await self._git("fetch")
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logger.error(f"Error switching to Bitbucket: {e}")
 
-    def _check_and_switch_repository(self) -> None:
-        current_remote = self._get_current_remote()
+    async def _check_and_switch_repository(self) -> None:
+        current_remote = await self._get_current_remote()
         if current_remote:
-            self._switch_to_bitbucket(current_remote)
+            await self._switch_to_bitbucket(current_remote)
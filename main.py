@@ -1,8 +1,17 @@
+import time
+
+started_at = time.perf_counter()
+
 import asyncio
 from contextlib import suppress
 import logging
 
 from bot.utils.launcher import process
+from bot.utils.loop_monitor import install_event_loop_policy
+from bot.utils.startup import startup
+
+startup.begin(started_at)
+startup.mark("imports")
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -16,6 +25,7 @@ async def main():
 
 if __name__ == '__main__':
     logger.info("Entering main block")
+    install_event_loop_policy()
     with suppress(KeyboardInterrupt):
         asyncio.run(main())
     logger.info("Application finished")